@@ -1,20 +1,36 @@
 # app.py
 from Apps.library_import import *
+from contextlib import asynccontextmanager
 from Apps.config import Config
 from Apps.services.translate_service import TranslationService
+from Apps.services.job_service import JobService
+from Apps.services.compile_service import CompileService
+from Apps.services.llm_service import LLMService
 from Apps.routes.ui_routes import router as ui_router
 from Apps.routes.journal_routes import router as journal_router
 from Apps.routes.llm_routes import router as llm_router
 from Apps.routes.pipeline_routes import router as pipeline_router
 from Apps.routes.translation_routes import router as translation_router
+from Apps.routes.metrics_routes import router as metrics_router
 
 
 # Initialize translation service
 Translator = TranslationService()
 
+@asynccontextmanager
+async def lifespan(app):
+    # Start/stop the background pipeline, xelatex workers and CORE client with the server
+    await LLMService.start()
+    await CompileService.start()
+    await JobService.start()
+    yield
+    await JobService.stop()
+    await CompileService.stop()
+    await LLMService.stop()
+
+
 # Initialize app & configuration
-app = Config.create_app()
-gemClient, GroqClient, CORE_API_KEY = Config.init_clients()
+app = Config.create_app(lifespan=lifespan)
 
 # Register routers
 app.include_router(ui_router)
@@ -22,6 +38,7 @@ app.include_router(journal_router)
 app.include_router(llm_router)
 app.include_router(pipeline_router)
 app.include_router(translation_router)
+app.include_router(metrics_router)
 
 
 # Test routes
@@ -0,0 +1,62 @@
+# File: Apps/batch_cli.py
+"""
+Run a JSONL manifest of journals through the full pipeline from the command line.
+
+Usage (from the repository root, so the Apps/ template paths resolve):
+    python -m Apps.batch_cli manifest.jsonl --llm-concurrency 4 --compile-concurrency 2
+
+Each line of the manifest is one `PulsusInputStr` JSON object. One JSON result
+line is printed per journal as soon as it finishes, followed by a summary line.
+"""
+import argparse
+import sys
+
+from Apps.config import Config
+from Apps.library_import import asyncio, json
+from Apps.services.batch_service import BatchService
+
+
+async def run(args) -> int:
+    failed = 0
+    out = open(args.output, "a", encoding="utf-8") if args.output else None
+    try:
+        with open(args.manifest, "r", encoding="utf-8") as manifest:
+            async for item in BatchService.run_manifest(
+                manifest, args.llm_concurrency, args.compile_concurrency
+            ):
+                line = json.dumps(item, ensure_ascii=False, default=str)
+                print(line, flush=True)
+                if out:
+                    out.write(line + "\n")
+                    out.flush()
+                if item.get("status") == "failed":
+                    failed += 1
+    finally:
+        if out:
+            out.close()
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("manifest", help="Path to the JSONL manifest")
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=Config.BATCH_LLM_CONCURRENCY,
+        help="Journals generating content with Gemini at the same time",
+    )
+    parser.add_argument(
+        "--compile-concurrency",
+        type=int,
+        default=Config.BATCH_COMPILE_CONCURRENCY,
+        help="Journals building HTML/PDF (xelatex) at the same time",
+    )
+    parser.add_argument(
+        "--output", help="Also append result lines to this JSONL file"
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from .library_import import (
     FastAPI,
     genai,
     Groq,
+    AsyncGroq,
 )
 
 # Load env vars
@@ -14,18 +15,142 @@ load_dotenv()
 
 class Config:
 
+    # Journal storage backend: "sqlite" (indexed, per-journal rows) or "json" (legacy files)
+    JOURNAL_STORE = os.getenv("JOURNAL_STORE", "sqlite")
+
+    # Background pipeline jobs
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", "500"))
+
+    # Batch runs (/pipeline/batch and Apps.batch_cli)
+    BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+    BATCH_COMPILE_CONCURRENCY = int(os.getenv("BATCH_COMPILE_CONCURRENCY", "2"))
+
+    # Article sections: "parallel" = one concurrent Gemini call per section (lower latency,
+    # more requests per journal), "combined" = one call for all sections
+    PIPELINE_SECTION_MODE = os.getenv("PIPELINE_SECTION_MODE", "parallel").lower()
+    # Ask Gemini for JSON matching the Pydantic models (response schema) instead of relying on the prompt
+    GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "1") == "1"
+
+    # xelatex compile pool
+    LATEX_WORKERS = int(os.getenv("LATEX_WORKERS", str(os.cpu_count() or 2)))
+    LATEX_TIMEOUT = float(os.getenv("LATEX_TIMEOUT", "180"))
+    # Upper bound; extra passes only run when the log asks for a rerun
+    LATEX_MAX_PASSES = int(os.getenv("LATEX_MAX_PASSES", "3"))
+    # Precompile brand preambles into xelatex formats (needs the mylatexformat package)
+    LATEX_PRECOMPILE = os.getenv("LATEX_PRECOMPILE", "1") == "1"
+    # Content-addressed cache of compiled PDFs / rendered HTML (Apps/DB/ArtifactCache)
+    ARTIFACT_CACHE_MAX_MB = int(os.getenv("ARTIFACT_CACHE_MAX_MB", "1024"))
+
+    # Jinja templates are compiled once per process (bytecode cached under Apps/DB/JinjaCache);
+    # APP_ENV=dev re-checks template files on every render so edits show up without a restart
+    APP_ENV = os.getenv("APP_ENV", "production").lower()
+    TEMPLATE_AUTO_RELOAD = APP_ENV in ("dev", "development")
+
+    # Google Translate calls in flight at once (all chunks of all fields of a journal)
+    TRANSLATE_WORKERS = int(os.getenv("TRANSLATE_WORKERS", "8"))
+    # Paragraph-level translation memory (Apps/DB/translationMemory.sqlite3); 0 disables it
+    TRANSLATION_MEMORY_MAX_ENTRIES = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "100000"))
+
+    # Retries of outbound calls: exponential backoff with jitter, bounded by a deadline (seconds)
+    LLM_RETRY_ATTEMPTS = int(os.getenv("LLM_RETRY_ATTEMPTS", "5"))
+    LLM_RETRY_DEADLINE = float(os.getenv("LLM_RETRY_DEADLINE", "180"))
+    TRANSLATE_RETRY_ATTEMPTS = int(os.getenv("TRANSLATE_RETRY_ATTEMPTS", "3"))
+    TRANSLATE_RETRY_DEADLINE = float(os.getenv("TRANSLATE_RETRY_DEADLINE", "30"))
+
+    # Per-upstream concurrency limits and circuit breaker (state at GET /metrics/upstreams)
+    UPSTREAM_CONCURRENCY = {
+        "gemini": int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+        "groq": int(os.getenv("GROQ_MAX_CONCURRENCY", "4")),
+        "core": int(os.getenv("CORE_MAX_CONCURRENCY", "4")),
+        "translate": int(os.getenv("TRANSLATE_MAX_CONCURRENCY", "8")),
+        "fake": int(os.getenv("FAKE_LLM_MAX_CONCURRENCY", "64")),
+    }
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+    # Client-side (requests/min, tokens/min) quotas per LLM key; 0 disables a limit.
+    # Defaults are the free-tier limits of the models in use - raise them for paid keys.
+    UPSTREAM_QUOTAS = {
+        "gemini": (
+            int(os.getenv("GEMINI_RPM", "15")),
+            int(os.getenv("GEMINI_TPM", "250000")),
+        ),
+        "groq": (
+            int(os.getenv("GROQ_RPM", "30")),
+            int(os.getenv("GROQ_TPM", "12000")),
+        ),
+        "fake": (int(os.getenv("FAKE_LLM_RPM", "0")), int(os.getenv("FAKE_LLM_TPM", "0"))),
+    }
+
+    # Shared CORE search client (opened with the app lifespan): pool size, keep-alive and timeout
+    CORE_HTTP_MAX_CONNECTIONS = int(os.getenv("CORE_HTTP_MAX_CONNECTIONS", "20"))
+    CORE_HTTP_MAX_KEEPALIVE = int(os.getenv("CORE_HTTP_MAX_KEEPALIVE", "10"))
+    CORE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("CORE_HTTP_KEEPALIVE_EXPIRY", "30"))
+    CORE_HTTP_TIMEOUT = float(os.getenv("CORE_HTTP_TIMEOUT", "15"))
+    # HTTP/2 is only negotiated when the optional `h2` package is installed
+    CORE_HTTP2 = os.getenv("CORE_HTTP2", "1") == "1"
+
+    # /llm/core/search responses cached per normalized query + limit (0 entries disables);
+    # CORE_CACHE_PERSIST=1 also keeps them in Apps/DB/responseCache.sqlite3 across restarts
+    CORE_CACHE_TTL = float(os.getenv("CORE_CACHE_TTL", "3600"))
+    CORE_CACHE_MAX_ENTRIES = int(os.getenv("CORE_CACHE_MAX_ENTRIES", "512"))
+    CORE_CACHE_PERSIST = os.getenv("CORE_CACHE_PERSIST", "0") == "1"
+
+    # Opt-in cache of Gemini/Groq answers per (model, prompt, config), kept in
+    # Apps/DB/responseCache.sqlite3; send "Cache-Control: no-cache" to /llm/* to bypass it
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "0") == "1"
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+    # Offline Gemini: "record" appends every answer to GEMINI_REPLAY_FILE, "replay" answers from it
+    GEMINI_REPLAY = os.getenv("GEMINI_REPLAY", "").lower()
+    GEMINI_REPLAY_FILE = os.getenv("GEMINI_REPLAY_FILE", "Apps/DB/geminiRecordings.jsonl")
+    _gemini_replay = None
+
+    # LLM providers (Apps/services/llm_providers.py). LLM_PROVIDER routes every call to one
+    # provider ("fake" = offline load tests); PIPELINE_PROVIDER is the journal pipeline's
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "").lower()
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    PIPELINE_PROVIDER = os.getenv("PIPELINE_PROVIDER", "gemini").lower()
+    PIPELINE_MODEL = os.getenv(
+        "PIPELINE_MODEL", "gemini-2.5-flash-lite" if PIPELINE_PROVIDER == "gemini" else ""
+    )
+    # Fake provider: seconds per call (± jitter), share of calls failing with a 503, RNG seed
+    FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.5"))
+    FAKE_LLM_JITTER = float(os.getenv("FAKE_LLM_JITTER", "0.2"))
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+    CORE_API_KEY = os.getenv("coreAPI3")
+
+    @staticmethod
+    def init_gemini():
+        """The Gemini client, or the shared record/replay client when GEMINI_REPLAY is set."""
+        if Config.GEMINI_REPLAY not in ("record", "replay"):
+            return genai.Client(api_key=os.getenv("gemAPI1"))
+        if Config._gemini_replay is None:
+            from Apps.services.replay_client import ReplayGeminiClient
+
+            real = genai.Client(api_key=os.getenv("gemAPI1")) if Config.GEMINI_REPLAY == "record" else None
+            Config._gemini_replay = ReplayGeminiClient(Config.GEMINI_REPLAY_FILE, real)
+        return Config._gemini_replay
+
+    @staticmethod
+    def init_groq():
+        return Groq(api_key=os.getenv("groqAPI2"))
+
     @staticmethod
-    def init_clients():
-        """Initialize Gemini and Groq clients."""
-        gem_client = genai.Client(api_key=os.getenv("gemAPI1"))
-        groq_client = Groq(api_key=os.getenv("groqAPI2"))
-        CORE_API_KEY = os.getenv("coreAPI3")
-        return gem_client, groq_client, CORE_API_KEY
+    def init_async_groq():
+        """Async Groq client for streamed and pipeline completions."""
+        return AsyncGroq(api_key=os.getenv("groqAPI2"))
 
     @staticmethod
-    def create_app():
+    def create_app(lifespan=None):
         """Initialize and return FastAPI app instance."""
-        app = FastAPI(title="Pulsus PDF Generator")
+        app = FastAPI(title="Pulsus PDF Generator", lifespan=lifespan)
         app.mount("/static", StaticFiles(directory="temp"), name="static")
         app.mount("/Logo", StaticFiles(directory="Apps/Logo"), name="Logo")
         app.templates = Jinja2Templates(directory="Apps/webTemplates")
@@ -11,13 +11,21 @@ for consistent access across different modules.
 import os
 import re
 import time
+import random
 import json
 import uuid
+import shutil
 import copy
+import hashlib
 import httpx
 import datetime
 import asyncio
+import sqlite3
+import threading
 import subprocess
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from math import e
 from pathlib import Path
 
@@ -31,24 +39,40 @@ from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
-from pydantic import BaseModel, Field, field_validator, computed_field, AnyUrl, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model, field_validator, computed_field, AnyUrl, EmailStr
 
-from typing import Annotated, Literal, Optional, List, Dict, Any
+from typing import Annotated, Literal, Optional, List, Dict, Any, get_args, get_origin
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 from dotenv import load_dotenv
 
 # ==========================
 # 🤖 AI / API SDK Imports
 # ==========================
 from google import genai
-from groq import Groq
+from groq import Groq, AsyncGroq
 
 # ==========================
 # 🌍 Translation
 # ==========================
 # from googletrans import Translator  # Optional alternative
 from deep_translator import GoogleTranslator
+from deep_translator.exceptions import (
+    InvalidSourceOrTargetLanguage,
+    LanguageNotSupportedException,
+    NotValidLength,
+    NotValidPayload,
+)
+
+# ==========================
+# 🌐 Optional extras
+# ==========================
+try:
+    import h2  # noqa: F401  (HTTP/2 support for httpx, from httpx[http2])
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # ==========================
 # 🧾 Module Metadata
@@ -58,13 +82,22 @@ __all__ = [
     "os",
     "re",
     "time",
+    "random",
     "json",
     "uuid",
+    "shutil",
     "copy",
+    "hashlib",
     "httpx",
     "datetime",
     "asyncio",
+    "sqlite3",
+    "threading",
     "subprocess",
+    "OrderedDict",
+    "deque",
+    "ThreadPoolExecutor",
+    "Future",
     "pathOfPathLib",
     "e",
     # FastAPI
@@ -80,6 +113,9 @@ __all__ = [
     "StaticFiles",
     # Pydantic
     "BaseModel",
+    "ConfigDict",
+    "ValidationError",
+    "create_model",
     "Field",
     "field_validator",
     "computed_field",
@@ -92,13 +128,25 @@ __all__ = [
     "List",
     "Dict",
     "Any",
+    "ABC",
+    "abstractmethod",
+    "get_args",
+    "get_origin",
     # Jinja / Env
     "Environment",
     "FileSystemLoader",
+    "FileSystemBytecodeCache",
     "load_dotenv",
     # AI SDKs
     "genai",
     "Groq",
+    "AsyncGroq",
     # Translation
     "GoogleTranslator",
+    "InvalidSourceOrTargetLanguage",
+    "LanguageNotSupportedException",
+    "NotValidLength",
+    "NotValidPayload",
+    # Optional extras
+    "HTTP2_AVAILABLE",
 ]
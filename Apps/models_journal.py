@@ -16,6 +16,8 @@ Key Classes:
     - UpdateInputPartJournal: Allows partial updates to existing journal records
     - TranslatePage: Manages multi-language journal translation
     - ArticleItem: Represents individual article/research paper details
+    - GeminiReferences, GeminiSections: Shape of the pipeline's Gemini output, used both as
+      Gemini response schemas and to validate the answers
 
 The module is designed to work with multiple journal templates (hilaris, alliedAcademy, omics)
 and automatically calculates publication timeline dates based on journal brand.
@@ -26,7 +28,9 @@ Version: 1.0
 
 from Apps.library_import import (
     BaseModel,
+    ConfigDict,
     Field,
+    create_model,
     EmailStr,
     AnyUrl,
     Annotated,
@@ -99,6 +103,7 @@ class CoreRequest(BaseModel):
     Attributes:
         prompt (str): Search query or instruction for the Core API.
                      Used to fetch research papers and academic articles.
+        limit (int): Maximum number of articles to return (default 20).
 
     Example:
         >>> request = CoreRequest(prompt="Find papers on machine learning")
@@ -110,6 +115,12 @@ class CoreRequest(BaseModel):
         title="Here, we can use Core for Research pages",
         description="Enter prompt for the Core to compute....",
     )
+    limit: int = Field(
+        20,
+        ge=1,
+        le=100,
+        description="Maximum number of articles to return.",
+    )
 
 
 class LatexRequest(BaseModel):
@@ -775,6 +786,49 @@ class TranslatePage(BaseModel):
     ]
 
 
+class TranslateManyPage(BaseModel):
+    """
+    Request to translate one journal page into several languages at once.
+
+    Attributes:
+        id (str): Unique identifier of the journal page to translate (3-6 characters).
+        languages (List[str]): Target language codes, e.g. ["es", "fr", "de"].
+                               Duplicates are dropped, order is kept.
+
+    Example:
+        >>> request = TranslateManyPage(id="test1", languages=["es", "fr", "de"])
+    """
+
+    id: Annotated[
+        str,
+        Field(
+            ...,
+            title="The id of the page",
+            description="Enter the id of the page....",
+            min_length=3,
+            max_length=6,
+        ),
+    ]
+    languages: Annotated[
+        List[str],
+        Field(
+            ...,
+            title="Target languages",
+            description="Language codes to translate the page into",
+            min_length=1,
+            max_length=20,
+        ),
+    ]
+
+    @field_validator("languages")
+    @classmethod
+    def validateLanguages(cls, value):
+        value = list(dict.fromkeys(lang.strip() for lang in value if lang.strip()))
+        if not value:
+            raise ValueError({"Message": "At least one target language is required."})
+        return value
+
+
 class ArticleItem(BaseModel):
     """
     Model representing a single article or research paper metadata.
@@ -867,6 +921,68 @@ class ArticleItem(BaseModel):
     ]
 
 
+class GeminiReference(BaseModel):
+    """
+    One reference of the article: an authentic, peer-reviewed journal article
+    with its full bibliographic details.
+    """
+
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    subContent: str = Field(..., min_length=1)
+    references: str = ""  # filled in by the templates
+    title: str = Field(..., min_length=1)
+    journalShortName: str
+    authors: List[str] = Field(..., min_length=1)
+    published: str
+    pageRangeOrNumber: str
+    volume: str
+    issues: str
+    DOI: str = Field(..., min_length=1)
+    url: str
+    parentLink: str
+
+
+class GeminiReferences(BaseModel):
+    """The references of the article, keyed "C001", "C002", ..."""
+
+    content: Dict[str, GeminiReference] = Field(..., min_length=1)
+
+    @staticmethod
+    def response_schema(count: int) -> type:
+        """
+        The same shape with explicit keys C001..C{count}, for Gemini response
+        schemas (which cannot express free-form object keys).
+        """
+        content = create_model(
+            "GeminiReferenceContent",
+            __doc__=GeminiReferences.__doc__,
+            **{f"C{i:03d}": (GeminiReference, ...) for i in range(1, count + 1)},
+        )
+        return create_model(
+            "GeminiReferenceSet", __doc__=GeminiReferences.__doc__, content=(content, ...)
+        )
+
+
+class GeminiSectionContent(BaseModel):
+    """The article sections written from the references."""
+
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    introduction: str = Field(..., min_length=1)
+    description: str = Field(..., min_length=1)
+    summary: str = Field(..., min_length=1)
+    abstract: str = Field(..., min_length=1)
+    discussion: str = Field(..., min_length=1)
+    keywords: str = Field(..., min_length=1)
+
+
+class GeminiSections(BaseModel):
+    """The sections of the article, written from its references."""
+
+    content: GeminiSectionContent
+
+
 class PulsusOutputStr(BaseModel):
     """
     Complete journal output model with all generated content.
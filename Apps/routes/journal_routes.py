@@ -17,19 +17,17 @@ def get_journal(
         ..., description="Enter journal ID", examples="J001", max_length=4
     )
 ):
-    data = IOService.fetchInputData()
-    if journal_id in data:
-        return data[journal_id]
+    record = IOService.fetchInputById(journal_id)
+    if record is not None:
+        return record
     raise HTTPException(status_code=404, detail="Journal not found")
 
 
 @router.post("/add")
 def create_journal(journal: PulsusInputStr):
-    data = IOService.fetchInputData()
-    if journal.id in data:
+    if IOService.inputExists(journal.id):
         raise HTTPException(status_code=400, detail="Journal ID already exists.")
-    data[journal.id] = journal.model_dump(exclude=["id"])
-    IOService.saveInputData(data)
+    IOService.upsertInputData(journal.id, journal.model_dump(exclude=["id"]))
     return JSONResponse(
         status_code=200, content={"message": "Journal added successfully"}
     )
@@ -37,12 +35,11 @@ def create_journal(journal: PulsusInputStr):
 
 @router.put("/update/{journal_id}")
 def updateInpJournal(journal_id: str, update_data: UpdateInputPartJournal):
-    data = IOService.fetchInputData()
+    tempStoreInfo = IOService.fetchInputById(journal_id)
 
-    if journal_id not in data:
+    if tempStoreInfo is None:
         raise HTTPException(status_code=404, detail="Journal Input not found")
 
-    tempStoreInfo = data[journal_id]
     tempStoreInfo["id"] = journal_id
 
     updatedInfo = update_data.model_dump(exclude_unset=True)
@@ -52,8 +49,7 @@ def updateInpJournal(journal_id: str, update_data: UpdateInputPartJournal):
 
     validateInpJournal = UpdateInputPartJournal(**tempStoreInfo)
 
-    data[journal_id] = validateInpJournal.model_dump(exclude=["id"])
-    IOService.saveInputData(data)
+    IOService.upsertInputData(journal_id, validateInpJournal.model_dump(exclude=["id"]))
 
     return JSONResponse(status_code=200, content={"message": "Successfully updated"})
 
@@ -61,17 +57,10 @@ def updateInpJournal(journal_id: str, update_data: UpdateInputPartJournal):
 @router.delete("/delete/{journal_id}")
 def delete_journal(journal_id: str):
 
-    input_data = IOService.fetchInputData()
-    if journal_id not in input_data:
+    if not IOService.deleteInputData(journal_id):
         details = "Journal ID doesn't exist. Available IDs:"
-        details += " ".join(input_data.keys())
+        details += " ".join(IOService.listInputIds())
         raise HTTPException(status_code=404, detail=details)
-
-    data = IOService.fetchInputData()
-    if journal_id not in data:
-        raise HTTPException(status_code=404, detail="Journal not found")
-    del data[journal_id]
-    IOService.saveInputData(data)
     return JSONResponse(
         status_code=200, content={"message": f"Perfectly deleted the {journal_id}"}
     )
@@ -1,25 +1,85 @@
-from fastapi import APIRouter
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from Apps.models_journal import GeminiRequest, GroqRequest, CoreRequest
 from Apps.services.llm_service import LLMService
 
 router = APIRouter(prefix="/llm", tags=["LLM Operations"])
 
 
+def _use_cache(cache_control: Optional[str]) -> bool:
+    """`Cache-Control: no-cache` (or no-store) skips the LLM response cache."""
+    directives = {d.strip().lower() for d in (cache_control or "").split(",")}
+    return not directives & {"no-cache", "no-store"}
+
+
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _event_stream(chunks, request: Request) -> StreamingResponse:
+    """
+    Relay text chunks as server-sent events: `data: {"text": ...}` per chunk,
+    then `event: done`. The response only starts once the first chunk has
+    arrived, so errors before it (503 open circuit, 500) keep their HTTP
+    status; later errors are sent as an `event: error`. The client is checked
+    between chunks, and the upstream stream is closed once it has gone.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def events():
+        try:
+            if first is not None:
+                yield _sse({"text": first})
+                async for text in chunks:
+                    if await request.is_disconnected():
+                        return
+                    yield _sse({"text": text})
+            yield _sse({}, "done")
+        except HTTPException as e:
+            yield _sse({"detail": e.detail}, "error")
+        finally:
+            await chunks.aclose()  # stops generation when the client left early
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/ask-gemini")
-def pulsus_ask_gemini(req: GeminiRequest):
+def pulsus_ask_gemini(req: GeminiRequest, cache_control: Optional[str] = Header(None)):
     """Handle Gemini prompt requests."""
-    response = LLMService.process_gemini(req.prompt)
+    response = LLMService.process_gemini(req.prompt, use_cache=_use_cache(cache_control))
     return {"response": response}
 
 
+@router.post("/ask-gemini/stream")
+async def pulsus_ask_gemini_stream(req: GeminiRequest, request: Request):
+    """Stream Gemini's answer token by token (server-sent events)."""
+    return await _event_stream(LLMService.stream_gemini(req.prompt), request)
+
+
 @router.post("/ask-groq")
-def pulsus_ask_groq(req: GroqRequest):
+def pulsus_ask_groq(req: GroqRequest, cache_control: Optional[str] = Header(None)):
     """Handle Groq (LLaMA) prompt requests."""
-    response = LLMService.process_groq(req.prompt)
+    response = LLMService.process_groq(req.prompt, use_cache=_use_cache(cache_control))
     return {"response": response}
 
 
+@router.post("/ask-groq/stream")
+async def pulsus_ask_groq_stream(req: GroqRequest, request: Request):
+    """Stream Groq's answer token by token (server-sent events)."""
+    return await _event_stream(LLMService.stream_groq(req.prompt), request)
+
+
 @router.post("/core/search")
 async def search_articles(req: CoreRequest):
     """Search scholarly articles using the CORE API."""
-    return await LLMService.process_core_search(req.prompt)
\ No newline at end of file
+    return await LLMService.process_core_search(req.prompt, req.limit)
\ No newline at end of file
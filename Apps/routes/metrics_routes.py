@@ -0,0 +1,36 @@
+from Apps.library_import import APIRouter
+from Apps.services.compile_service import CompileService
+from Apps.services.job_service import JobService
+from Apps.services.translate_service import TranslationService
+from Apps.services.upstream_guard import UpstreamGuard
+from Apps.services.rate_limiter import RateLimiter
+from Apps.services.response_cache import ResponseCache
+from Apps.services.llm_providers import LLMProvider
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("")
+def all_metrics():
+    """Runtime metrics of the background pools."""
+    return {
+        "compile": CompileService.metrics(),
+        "jobs": JobService.stats(),
+        "translation_memory": TranslationService.memory_metrics(),
+        "upstreams": UpstreamGuard.all_metrics(),
+        "rate_limits": RateLimiter.all_metrics(),
+        "response_caches": ResponseCache.all_metrics(),
+        "llm_providers": LLMProvider.all_metrics(),
+    }
+
+
+@router.get("/compile")
+def compile_metrics():
+    """xelatex pool: queue depth, running jobs, outcomes and timings."""
+    return CompileService.metrics()
+
+
+@router.get("/upstreams")
+def upstream_metrics():
+    """Per-upstream concurrency, circuit breaker state and client-side rate limits."""
+    return {"guards": UpstreamGuard.all_metrics(), "rate_limits": RateLimiter.all_metrics()}
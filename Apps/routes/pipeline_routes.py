@@ -1,13 +1,60 @@
-from Apps.library_import import APIRouter, HTTPException
+from Apps.config import Config
+from Apps.library_import import APIRouter, JSONResponse, Query, json
 from Apps.models_journal import PulsusInputStr
-from Apps.services.pipeline_service import PipelineService
+from Apps.services.job_service import JobService
+from Apps.services.batch_service import BatchService
+from fastapi import File, UploadFile
+from fastapi.responses import StreamingResponse
 
 router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
 
 
-@router.post("/journal-full-process")
+@router.post("/journal-full-process", status_code=202)
 async def journal_full_process(journal: PulsusInputStr):
     """
-    Route that triggers the full journal -> PDF pipeline.
+    Route that queues the full journal -> PDF pipeline.
+    Returns a job ID immediately; poll `/pipeline/jobs/{job_id}` for progress.
     """
-    return await PipelineService.process_journal(journal)
\ No newline at end of file
+    job = await JobService.enqueue(journal)
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/pipeline/jobs/{job['id']}",
+        },
+    )
+
+
+@router.post("/batch")
+async def journal_batch(
+    manifest: UploadFile = File(
+        ..., description="JSONL manifest, one PulsusInputStr object per line"
+    ),
+    llm_concurrency: int = Query(Config.BATCH_LLM_CONCURRENCY, ge=1, le=64),
+    compile_concurrency: int = Query(Config.BATCH_COMPILE_CONCURRENCY, ge=1, le=32),
+):
+    """
+    Run every journal in a JSONL manifest through the full pipeline.
+    Streams one JSON line per journal as it completes, then a summary line.
+    """
+
+    async def stream():
+        async for item in BatchService.run_manifest(
+            manifest.file, llm_concurrency, compile_concurrency
+        ):
+            yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/jobs")
+def pipeline_jobs_stats():
+    """Queue depth and job counts per status."""
+    return JobService.stats()
+
+
+@router.get("/jobs/{job_id}")
+def pipeline_job_status(job_id: str):
+    """Current status, step and progress events of a pipeline job."""
+    return JobService.get(job_id)
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
-from Apps.models_journal import TranslatePage
+from fastapi.responses import StreamingResponse
+from Apps.library_import import json
+from Apps.models_journal import TranslatePage, TranslateManyPage
 from Apps.services.translation_pipeline_service import TranslationPipelineService
 from Apps.services.translate_service import TranslationService
 
@@ -13,3 +15,24 @@ async def translate_pdf(translatePage: TranslatePage):
     Endpoint to translate an existing journal output into another language (PDF + HTML)
     """
     return await TranslationPipelineService.translate_journal(translatePage)
+
+
+@router.post("/translate-many")
+async def translate_pdf_many(request: TranslateManyPage):
+    """
+    Translate one journal output into several languages concurrently (PDF + HTML each).
+    Streams one JSON line per language as it finishes, then a summary line.
+    """
+    # Fail fast (e.g. 404 for an unknown ID) before the streaming response starts
+    TranslationPipelineService._fetch_source(request.id)
+    results = TranslationPipelineService.translate_many(request.id, request.languages)
+
+    async def stream():
+        try:
+            async for item in results:
+                yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        finally:
+            # Cancels the remaining languages when the client disconnects
+            await results.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
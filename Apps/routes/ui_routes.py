@@ -3,11 +3,11 @@ from Apps.library_import import (
     APIRouter,
     os,
     uuid,
-    subprocess,
 )
 from Apps.config import Config
 from Apps.models_journal import LatexRequest
 from Apps.language_fonts import languages
+from Apps.services.compile_service import CompileService
 
 app = Config.create_app()
 templates = Config.create_app().templates
@@ -127,7 +127,7 @@ def ui_delete_journal(request: Request):
 
 # PDF compilation route
 @router.post("/compile-latex")
-def compile_latex(req: LatexRequest):
+async def compile_latex(req: LatexRequest):
     job_id = str(uuid.uuid4())
     tex_file = f"temp/{job_id}.tex"
     pdf_file = f"temp/{job_id}.pdf"
@@ -136,14 +136,8 @@ def compile_latex(req: LatexRequest):
     with open(tex_file, "w", encoding="utf-8") as f:
         f.write(req.source)
 
-    try:
-        subprocess.run(
-            ["xelatex", "-interaction=nonstopmode", "-output-directory=temp", tex_file],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-    except subprocess.CalledProcessError as e:
-        return {"error": e.stderr}
+    result = await CompileService.compile(tex_file)
+    if not result["ok"]:
+        return {"error": result["error"]}
 
     return {"pdf_path": f"/static/{job_id}.pdf"}
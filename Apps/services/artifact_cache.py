@@ -0,0 +1,169 @@
+# File: Apps/services/artifact_cache.py
+from Apps.config import Config
+from Apps.library_import import os, re, hashlib, shutil, threading, Dict, Any
+from Apps.library_import import pathOfPathLib
+
+
+class ArtifactCache:
+    """
+    Content-addressed, size-bounded disk cache for build artifacts
+    (compiled PDFs, rendered HTML).
+
+    PDFs are keyed by the rendered LaTeX plus the content of every font and
+    image file it references, so a byte-identical rebuild becomes a file
+    copy/hardlink instead of a xelatex run. Least recently used entries are
+    evicted once the cache grows past `ARTIFACT_CACHE_MAX_MB`.
+    """
+
+    CACHE_DIR = pathOfPathLib(__file__).resolve().parent.parent / "DB" / "ArtifactCache"
+    MAX_BYTES = Config.ARTIFACT_CACHE_MAX_MB * 1024 * 1024
+
+    GRAPHICS_PATTERN = re.compile(r"\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}")
+    FONT_PATH_PATTERN = re.compile(r"Path\s*=\s*([^,\]]+)")
+    FONT_NAME_PATTERN = re.compile(
+        r"\\(?:setmainfont|setsansfont|setmonofont|fontspec|newfontfamily\s*\\\w+)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}"
+    )
+
+    _lock = threading.Lock()
+    _file_digests: Dict[tuple, str] = {}
+    _stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    # ==========================
+    # 🔑 Keys
+    # ==========================
+    @staticmethod
+    def latex_key(tex_source: str, tex_dir) -> str:
+        """Hash of the LaTeX source plus the fonts and images it pulls in."""
+        digest = hashlib.sha256(tex_source.encode("utf-8"))
+        for path in ArtifactCache._referenced_files(tex_source, pathOfPathLib(tex_dir)):
+            digest.update(path.name.encode("utf-8"))
+            digest.update(ArtifactCache._file_digest(path).encode("ascii"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def text_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    # ==========================
+    # 📦 Fetch & Store
+    # ==========================
+    @staticmethod
+    def fetch(key: str, suffix: str, destination) -> bool:
+        """
+        Place the cached artifact at `destination`. Returns False on a miss.
+
+        Any existing `destination` is removed first, hit or miss: it may be a
+        hardlink into the cache, and the rebuild after a miss must not write
+        through it.
+        """
+        cached = ArtifactCache.CACHE_DIR / f"{key}{suffix}"
+        destination = pathOfPathLib(destination)
+        if destination.exists():
+            destination.unlink()
+        if not cached.exists():
+            with ArtifactCache._lock:
+                ArtifactCache._stats["misses"] += 1
+            return False
+
+        try:
+            os.link(cached, destination)
+        except OSError:
+            shutil.copyfile(cached, destination)
+        os.utime(cached)  # mark as recently used
+        with ArtifactCache._lock:
+            ArtifactCache._stats["hits"] += 1
+        return True
+
+    @staticmethod
+    def store(key: str, suffix: str, source) -> None:
+        source = pathOfPathLib(source)
+        if not source.exists():
+            return
+        ArtifactCache.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached = ArtifactCache.CACHE_DIR / f"{key}{suffix}"
+        temp = cached.with_name(f"{cached.name}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source, temp)
+        os.replace(temp, cached)
+        with ArtifactCache._lock:
+            ArtifactCache._stats["stores"] += 1
+        ArtifactCache._evict()
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        sizes = []
+        if ArtifactCache.CACHE_DIR.exists():
+            for entry in ArtifactCache.CACHE_DIR.glob("*"):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    sizes.append(entry.stat().st_size)
+                except FileNotFoundError:
+                    pass  # evicted meanwhile
+        with ArtifactCache._lock:
+            counters = dict(ArtifactCache._stats)
+        return {
+            **counters,
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": ArtifactCache.MAX_BYTES,
+        }
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    @staticmethod
+    def _evict() -> None:
+        with ArtifactCache._lock:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry)
+                for entry in ArtifactCache.CACHE_DIR.glob("*")
+                if not entry.name.endswith(".tmp")
+            ]
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries, key=lambda item: item[0]):
+                if total <= ArtifactCache.MAX_BYTES:
+                    break
+                try:
+                    entry.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                ArtifactCache._stats["evictions"] += 1
+
+    @staticmethod
+    def _referenced_files(tex_source: str, tex_dir: pathOfPathLib) -> list:
+        files = set()
+        for ref in ArtifactCache.GRAPHICS_PATTERN.findall(tex_source):
+            path = (tex_dir / ref.strip()).resolve()
+            if path.is_file():
+                files.add(path)
+
+        font_dirs = {
+            (tex_dir / ref.strip()).resolve()
+            for ref in ArtifactCache.FONT_PATH_PATTERN.findall(tex_source)
+        }
+        font_names = [
+            pathOfPathLib(name.strip()).stem
+            for name in ArtifactCache.FONT_NAME_PATTERN.findall(tex_source)
+        ]
+        for font_dir in font_dirs:
+            if not font_dir.is_dir():
+                continue
+            for font_file in font_dir.iterdir():
+                if any(font_file.name.startswith(name) for name in font_names):
+                    files.add(font_file)
+        return sorted(files)
+
+    @staticmethod
+    def _file_digest(path: pathOfPathLib) -> str:
+        stat = path.stat()
+        cache_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        digest = ArtifactCache._file_digests.get(cache_key)
+        if digest is None:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            ArtifactCache._file_digests[cache_key] = digest
+        return digest
@@ -0,0 +1,121 @@
+# File: Apps/services/batch_service.py
+from Apps.config import Config
+from Apps.library_import import asyncio, json, time, HTTPException, Dict, Any
+from Apps.models_journal import PulsusInputStr
+from Apps.services.pipeline_service import PipelineService
+from pydantic import ValidationError
+
+
+class BatchService:
+    """
+    Runs many journals through the full pipeline from a JSONL manifest
+    (one `PulsusInputStr` JSON object per line).
+
+    Gemini stages and xelatex builds have separate concurrency limits, and
+    per-item results are yielded as soon as each journal finishes.
+    """
+
+    @staticmethod
+    async def run_manifest(
+        lines,
+        llm_concurrency: int = Config.BATCH_LLM_CONCURRENCY,
+        compile_concurrency: int = Config.BATCH_COMPILE_CONCURRENCY,
+    ):
+        """
+        Async generator over per-item result dicts, in completion order,
+        followed by one final {"summary": {...}} dict.
+
+        `lines` may be a sync or async iterable of str/bytes lines.
+        """
+        llm_concurrency = max(1, llm_concurrency)
+        compile_concurrency = max(1, compile_concurrency)
+        llm_limit = asyncio.Semaphore(llm_concurrency)
+        compile_limit = asyncio.Semaphore(compile_concurrency)
+        # Bound how many manifest items are in flight, so huge manifests are
+        # read lazily instead of being turned into thousands of tasks at once.
+        window = asyncio.Semaphore(llm_concurrency + compile_concurrency)
+
+        results: asyncio.Queue = asyncio.Queue()
+        tasks = []
+        seen_ids = set()
+        started = time.time()
+
+        async def run_item(line_no: int, raw: str) -> None:
+            item = {"line": line_no, "id": None}
+            try:
+                journal = PulsusInputStr(**json.loads(raw))
+                item["id"] = journal.id.strip()
+                if item["id"] in seen_ids:
+                    raise HTTPException(
+                        status_code=400, detail="Duplicate journal ID in manifest."
+                    )
+                seen_ids.add(item["id"])
+                item["result"] = await PipelineService.process_journal(
+                    journal, llm_limit=llm_limit, compile_limit=compile_limit
+                )
+                item["status"] = "succeeded"
+            except json.JSONDecodeError as e:
+                item.update(status="failed", error=f"Invalid JSON: {e}")
+            except ValidationError as e:
+                item.update(
+                    status="failed",
+                    error=json.loads(e.json(include_url=False, include_input=False)),
+                )
+            except HTTPException as e:
+                item.update(status="failed", error=e.detail)
+            except Exception as e:
+                item.update(status="failed", error=str(e))
+            finally:
+                window.release()
+            item["elapsed"] = round(time.time() - started, 2)
+            await results.put(item)
+
+        async def feed() -> None:
+            line_no = 0
+            try:
+                async for raw in BatchService._aiter(lines):
+                    line_no += 1
+                    if isinstance(raw, bytes):
+                        raw = raw.decode("utf-8")
+                    if not raw.strip():
+                        continue
+                    await window.acquire()
+                    tasks.append(asyncio.create_task(run_item(line_no, raw)))
+                await asyncio.gather(*tasks)
+            finally:
+                await results.put(None)
+
+        feeder = asyncio.create_task(feed())
+        counts = {"succeeded": 0, "failed": 0}
+        try:
+            while True:
+                item = await results.get()
+                if item is None:
+                    break
+                counts[item["status"]] += 1
+                yield item
+            await feeder
+        finally:
+            # Consumer went away (e.g. client disconnected): stop outstanding work
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "summary": {
+                **counts,
+                "total": counts["succeeded"] + counts["failed"],
+                "elapsed": round(time.time() - started, 2),
+                "llm_concurrency": llm_concurrency,
+                "compile_concurrency": compile_concurrency,
+            }
+        }
+
+    @staticmethod
+    async def _aiter(lines):
+        if hasattr(lines, "__aiter__"):
+            async for line in lines:
+                yield line
+        else:
+            for line in lines:
+                yield line
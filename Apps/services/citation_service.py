@@ -0,0 +1,64 @@
+# File: Apps/services/citation_service.py
+from Apps.library_import import re, Dict
+
+
+class CitationService:
+    """
+    Rewrites the `[n].` citation markers Gemini writes into the section texts.
+
+    A lookup table (marker number -> replacement) is built once from the
+    journal's `content` references, then every section is rewritten in a single
+    regex pass, instead of one `str.replace` per reference and section.
+    Markers without a matching reference are left untouched.
+    """
+
+    MARKER_PATTERN = re.compile(r"\[(\d+)\]\.")
+
+    # ==========================
+    # 📚 Lookup tables
+    # ==========================
+    @staticmethod
+    def html_table(content: dict, brand: str) -> Dict[str, str]:
+        """Anchors to the reference list; Irjesti shows author-year labels."""
+        table = {}
+        for number, ref in enumerate(content.values(), start=1):
+            label = (
+                f"[{CitationService.author_year(ref)}]" if brand == "Irjesti.tex" else number
+            )
+            table[str(number)] = f"[<a href='#{number}' title='{number}'>{label}</a>]."
+        return table
+
+    @staticmethod
+    def latex_table(content: dict) -> Dict[str, str]:
+        """
+        Irjesti author-year citations for the PDF. `rizzBro`/`hoez` survive
+        `latex_escape` and are turned into \\textbf{...} by it.
+        """
+        return {
+            str(number): f"rizzBro({CitationService.author_year(ref)}).hoez"
+            for number, ref in enumerate(content.values(), start=1)
+        }
+
+    @staticmethod
+    def author_year(ref: dict) -> str:
+        return f"{ref['authors_short'].split(', ')[0]} et al., {ref['published']}"
+
+    # ==========================
+    # ✏️ Rewriting
+    # ==========================
+    @staticmethod
+    def link(text, table: Dict[str, str], suffix: str = ""):
+        """Replace every known `[n].` in `text` with `table[n] + suffix`."""
+        if not isinstance(text, str) or "[" not in text:
+            return text
+        return CitationService.MARKER_PATTERN.sub(
+            lambda m: table[m.group(1)] + suffix if m.group(1) in table else m.group(0),
+            text,
+        )
+
+    @staticmethod
+    def link_sections(record: dict, sections, table: Dict[str, str], suffix: str = "") -> None:
+        """Rewrite `record[section]` in place for each of `sections` that is present."""
+        for section in sections:
+            if section in record:
+                record[section] = CitationService.link(record[section], table, suffix)
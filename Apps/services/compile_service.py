@@ -0,0 +1,331 @@
+# File: Apps/services/compile_service.py
+from Apps.config import Config
+from Apps.library_import import asyncio, subprocess, time, re, hashlib, Dict, Any, Optional
+from Apps.library_import import pathOfPathLib
+from Apps.services.format_service import FormatService
+from Apps.services.artifact_cache import ArtifactCache
+
+
+class CompileService:
+    """
+    Shared xelatex compile pool.
+
+    A fixed number of worker tasks (`LATEX_WORKERS`) pull compile jobs from one
+    queue and each drives at most one xelatex process at a time, so PDF
+    rendering scales with cores without blocking the event loop. Jobs get a
+    per-job timeout, and cancelling the returned future kills the running
+    xelatex process.
+
+    A document is only compiled again when the previous pass asks for it
+    (rerun warnings in the log, or undefined references with a changed .aux).
+    Jobs submitted with a `format_name` use a precompiled preamble format
+    from `FormatService` when one can be built, and documents whose LaTeX,
+    fonts and images are unchanged are served from `ArtifactCache`.
+    """
+
+    WORKERS = Config.LATEX_WORKERS
+    TIMEOUT = Config.LATEX_TIMEOUT
+    MAX_PASSES = Config.LATEX_MAX_PASSES
+
+    # Messages from LaTeX, hyperref/rerunfilecheck, zref etc. that mean "compile again"
+    RERUN_PATTERN = re.compile(
+        r"Rerun to get|Please rerun|Label\(s\) may have changed|rerun LaTeX", re.IGNORECASE
+    )
+    UNDEFINED_PATTERN = re.compile(r"There were undefined references|undefined references")
+
+    _queue: Optional[asyncio.Queue] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _workers: list = []
+
+    _metrics: Dict[str, Any] = {
+        "submitted": 0,
+        "completed": 0,
+        "failed": 0,
+        "timed_out": 0,
+        "cancelled": 0,
+        "running": 0,
+        "busy_seconds": 0.0,
+        "passes_histogram": {},
+    }
+
+    # ==========================
+    # 🔁 Lifecycle
+    # ==========================
+    @staticmethod
+    async def start() -> None:
+        """Spawn the worker tasks on the running loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if CompileService._queue is not None and CompileService._loop is loop:
+            return
+        CompileService._loop = loop
+        CompileService._queue = asyncio.Queue()
+        CompileService._workers = [
+            asyncio.create_task(CompileService._worker())
+            for _ in range(CompileService.WORKERS)
+        ]
+        print(f"[INFO] LaTeX compile pool started with {CompileService.WORKERS} workers")
+
+    @staticmethod
+    async def stop() -> None:
+        for task in CompileService._workers:
+            task.cancel()
+        await asyncio.gather(*CompileService._workers, return_exceptions=True)
+        CompileService._workers = []
+        CompileService._queue = None
+        CompileService._loop = None
+
+    # ==========================
+    # 📥 Submission
+    # ==========================
+    @staticmethod
+    async def submit(
+        tex_path,
+        max_passes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        format_name: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> asyncio.Future:
+        """
+        Queue `tex_path` for compilation (run inside its own folder).
+        `format_name` (e.g. the brand) enables the precompiled preamble format.
+        Returns a future resolving to the result dict of `_run_job`.
+        """
+        await CompileService.start()
+        future = asyncio.get_running_loop().create_future()
+        job = {
+            "tex_path": pathOfPathLib(tex_path).resolve(),
+            "max_passes": max_passes or CompileService.MAX_PASSES,
+            "timeout": timeout or CompileService.TIMEOUT,
+            "format_name": format_name,
+            "use_cache": use_cache,
+            "queued_at": time.time(),
+        }
+        CompileService._metrics["submitted"] += 1
+        await CompileService._queue.put((job, future))
+        return future
+
+    @staticmethod
+    async def compile(
+        tex_path,
+        max_passes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        format_name: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """Submit and wait. Cancelling the caller cancels (and kills) the job."""
+        return await (
+            await CompileService.submit(
+                tex_path, max_passes, timeout, format_name, use_cache
+            )
+        )
+
+    @staticmethod
+    def metrics() -> Dict[str, Any]:
+        done = CompileService._metrics["completed"] + CompileService._metrics["failed"]
+        return {
+            **CompileService._metrics,
+            "workers": CompileService.WORKERS,
+            "queue_depth": CompileService._queue.qsize() if CompileService._queue else 0,
+            "avg_seconds": (
+                round(CompileService._metrics["busy_seconds"] / done, 3) if done else None
+            ),
+            "cache": ArtifactCache.stats(),
+        }
+
+    @staticmethod
+    def error_summary(log_path) -> str:
+        """Pull the `! ...` error lines out of a xelatex log."""
+        log_path = pathOfPathLib(log_path)
+        if not log_path.exists():
+            return "LaTeX compilation failed. No log file was written."
+        with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+            errors = [line for line in f if line.startswith("! ")]
+        return "\n".join(errors) or f"LaTeX compilation failed. Full log in {log_path}"
+
+    # ==========================
+    # ⚙️ Workers
+    # ==========================
+    @staticmethod
+    async def _worker() -> None:
+        while True:
+            job, future = await CompileService._queue.get()
+            try:
+                if future.done():  # cancelled while waiting in the queue
+                    CompileService._metrics["cancelled"] += 1
+                    continue
+                run = asyncio.create_task(CompileService._run_job(job))
+                future.add_done_callback(
+                    lambda f, run=run: run.cancel() if f.cancelled() else None
+                )
+                try:
+                    result = await run
+                except asyncio.CancelledError:
+                    CompileService._metrics["cancelled"] += 1
+                    if not future.cancelled():
+                        raise  # the worker itself is shutting down
+                    continue
+                except Exception as e:
+                    CompileService._metrics["failed"] += 1
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                CompileService._queue.task_done()
+
+    @staticmethod
+    async def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+        tex_path = job["tex_path"]
+        deadline = time.monotonic() + job["timeout"]
+        started = time.time()
+        result = {
+            "ok": False,
+            "passes": 0,
+            "rerun_reasons": [],
+            "format": None,
+            "cached": False,
+            "returncode": None,
+            "output": "",
+            "error": None,
+            "log_path": str(tex_path.with_suffix(".log")),
+            "queued_seconds": round(started - job["queued_at"], 3),
+        }
+
+        aux_path = tex_path.with_suffix(".aux")
+        pdf_path = tex_path.with_suffix(".pdf")
+        fmt = cache_key = None
+        CompileService._metrics["running"] += 1
+        try:
+            if job["use_cache"]:
+                cache_key = await asyncio.to_thread(
+                    ArtifactCache.latex_key,
+                    tex_path.read_text(encoding="utf-8"),
+                    tex_path.parent,
+                )
+                if ArtifactCache.fetch(cache_key, ".pdf", pdf_path):
+                    result["ok"] = result["cached"] = True
+                    return result
+            if job["format_name"]:
+                fmt = result["format"] = await FormatService.prepare(
+                    tex_path, job["format_name"]
+                )
+            for _ in range(job["max_passes"]):
+                aux_before = CompileService._digest(aux_path)
+                try:
+                    returncode, output = await CompileService._run_xelatex(
+                        tex_path, deadline - time.monotonic(), fmt
+                    )
+                    if (
+                        returncode not in (0, None)
+                        and fmt
+                        and FormatService.failed_to_load(output, result["log_path"])
+                    ):
+                        # The format could not be loaded (e.g. engine upgraded): compile without it
+                        FormatService.discard(fmt)
+                        FormatService.cleanup(tex_path, fmt)
+                        fmt = result["format"] = None
+                        returncode, output = await CompileService._run_xelatex(
+                            tex_path, deadline - time.monotonic()
+                        )
+                except OSError as e:
+                    result["ok"] = False
+                    result["error"] = f"Could not start xelatex: {e}"
+                    break
+                result["passes"] += 1
+                result["returncode"] = returncode
+                result["output"] = output
+                # A failed rerun leaves a broken PDF even after a clean first pass
+                result["ok"] = False
+                if returncode is None:
+                    CompileService._metrics["timed_out"] += 1
+                    result["error"] = f"LaTeX compilation timed out after {job['timeout']}s"
+                    break
+                if returncode != 0:
+                    result["error"] = CompileService.error_summary(result["log_path"])
+                    break
+                result["ok"] = True
+                reason = CompileService._rerun_reason(
+                    result["log_path"], aux_before, CompileService._digest(aux_path)
+                )
+                if reason is None:
+                    break
+                result["rerun_reasons"].append(reason)
+            if result["ok"] and cache_key:
+                await asyncio.to_thread(ArtifactCache.store, cache_key, ".pdf", pdf_path)
+        finally:
+            FormatService.cleanup(tex_path, fmt)
+            CompileService._metrics["running"] -= 1
+            duration = time.time() - started
+            result["seconds"] = round(duration, 3)
+            CompileService._metrics["busy_seconds"] += duration
+
+        CompileService._metrics["completed" if result["ok"] else "failed"] += 1
+        if result["ok"]:
+            histogram = CompileService._metrics["passes_histogram"]
+            histogram[result["passes"]] = histogram.get(result["passes"], 0) + 1
+        return result
+
+    @staticmethod
+    def _rerun_reason(log_path, aux_before, aux_after) -> Optional[str]:
+        """Why another pass is needed, or None when cross-references are stable."""
+        log_path = pathOfPathLib(log_path)
+        if not log_path.exists():
+            return None
+        log = log_path.read_text(encoding="utf-8", errors="ignore")
+        match = CompileService.RERUN_PATTERN.search(log)
+        if match:
+            return match.group(0)
+        if aux_before != aux_after and CompileService.UNDEFINED_PATTERN.search(log):
+            return "undefined references with a changed .aux"
+        return None
+
+    @staticmethod
+    def _digest(path) -> Optional[str]:
+        path = pathOfPathLib(path)
+        if not path.exists():
+            return None
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+
+    @staticmethod
+    async def _run_xelatex(tex_path, timeout: float, fmt: Optional[str] = None):
+        """Run one xelatex pass, optionally loading the precompiled format `fmt`."""
+        command = ["xelatex", "-interaction=nonstopmode"]
+        if fmt:
+            # The rewritten copy, with the original job name so outputs land in the usual files
+            command += [f"-jobname={tex_path.stem}", f"&{fmt}", FormatService.source(tex_path).name]
+        else:
+            command.append(tex_path.name)
+        return await CompileService.run_command(command, tex_path.parent, timeout)
+
+    @staticmethod
+    async def run_command(command: list, cwd, timeout: float):
+        """
+        Run a TeX command. Returns (returncode, output); returncode is None on timeout.
+        subprocess.Popen is waited on from a thread so it works on every event loop
+        (uvicorn's Windows selector loop has no asyncio subprocess support).
+        """
+        if timeout <= 0:
+            return None, ""
+        proc = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        try:
+            output, _ = await asyncio.to_thread(proc.communicate, timeout=timeout)
+            return proc.returncode, output
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            try:
+                output, _ = await asyncio.to_thread(proc.communicate, timeout=5)
+            except subprocess.TimeoutExpired:
+                output = ""
+            return None, output
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
@@ -0,0 +1,210 @@
+# File: Apps/services/format_service.py
+from Apps.config import Config
+from Apps.library_import import asyncio, re, hashlib, shutil, subprocess, os, Dict, Optional
+from Apps.library_import import pathOfPathLib
+
+
+class FormatService:
+    """
+    Precompiled xelatex formats (mylatexformat-style) for the brand templates.
+
+    The document class and the font-independent packages of a rendered
+    preamble (tikz, titlesec, fancyhdr, ...) are dumped once into a `.fmt`
+    file and loaded with `&<format>` on every compile, so xelatex no longer
+    re-parses them for each document.
+
+    XeTeX cannot dump OpenType fonts into a format, so the fontspec /
+    polyglossia block from `LatexLanguageConfig` (and every package that is
+    not in `PRELOADABLE`) stays in the document and is processed normally.
+    Formats are keyed by a hash of the dumped preamble plus the engine
+    version, so editing a template builds a fresh format automatically.
+
+    The delivered document is never modified: the rewritten source goes to
+    a temporary `<document>_fmt.tex` next to it, compiled with
+    `-jobname=<document>` so the PDF, log and aux keep their usual names.
+    """
+
+    FORMAT_DIR = pathOfPathLib(__file__).resolve().parent.parent / "DB" / "LatexFormats"
+
+    # Packages that load no fonts and are safe to load ahead of fontspec/polyglossia
+    PRELOADABLE = {
+        "geometry", "tikz", "xcolor", "graphicx", "titlesec", "fancyhdr",
+        "multicol", "framed", "lettrine", "zref-abspage", "refcount",
+        "ragged2e", "tcolorbox", "mdframed", "setspace", "enumitem",
+        "eso-pic", "atbegshi", "pict2e", "latexsym", "wasysym", "array",
+        "indentfirst", "xurl",
+    }
+    USEPACKAGE_PATTERN = re.compile(r"^\s*\\usepackage\s*(\[[^\]]*\])?\s*\{([^}]*)\}")
+    DUMP_MARKER = "\\csname endofdump\\endcsname"
+    # Terminal/log lines of a format that cannot be loaded (missing, or dumped by another engine)
+    LOAD_ERROR_PATTERN = re.compile(
+        r"can't find the format file|Fatal format file error|was written by|format file .* is too short"
+    )
+
+    _locks: Dict[str, asyncio.Lock] = {}
+    _broken: set = set()
+    _engine_version: Optional[str] = None
+
+    @staticmethod
+    async def prepare(tex_path, brand: str) -> Optional[str]:
+        """
+        Make sure a format for this document's preamble exists, copy it next to
+        `tex_path` and write the copy of the document that skips the dumped
+        part (`source(tex_path)`).
+        Returns the format name, or None when the document should compile normally.
+        """
+        if not Config.LATEX_PRECOMPILE:
+            return None
+        tex_path = pathOfPathLib(tex_path)
+        source = tex_path.read_text(encoding="utf-8")
+        head, rest = FormatService._split_preamble(source)
+        if head is None:
+            return None
+
+        engine = await FormatService._engine()
+        if engine is None:
+            return None
+        digest = hashlib.sha1(f"{engine}\n{head}".encode("utf-8")).hexdigest()[:16]
+        name = f"{re.sub(r'[^A-Za-z0-9]+', '', brand) or 'doc'}_{digest}"
+        if name in FormatService._broken:
+            return None
+
+        fmt_file = await FormatService._build(name, head)
+        if fmt_file is None:
+            return None
+
+        local = tex_path.parent / fmt_file.name
+        if local.exists():
+            local.unlink()
+        try:
+            os.link(fmt_file, local)
+        except OSError:
+            shutil.copyfile(fmt_file, local)
+        FormatService.source(tex_path).write_text(
+            f"{head}{FormatService.DUMP_MARKER}\n{rest}", encoding="utf-8"
+        )
+        return name
+
+    @staticmethod
+    def source(tex_path) -> pathOfPathLib:
+        """The rewritten copy of `tex_path` that is compiled with the format."""
+        tex_path = pathOfPathLib(tex_path)
+        return tex_path.with_name(f"{tex_path.stem}_fmt.tex")
+
+    @staticmethod
+    def failed_to_load(output: str, log_path) -> bool:
+        """Whether a xelatex run failed because the format itself could not be loaded."""
+        if FormatService.LOAD_ERROR_PATTERN.search(output or ""):
+            return True
+        log_path = pathOfPathLib(log_path)
+        if not log_path.exists():
+            return False
+        head = log_path.read_text(encoding="utf-8", errors="ignore")[:4000]
+        return FormatService.LOAD_ERROR_PATTERN.search(head) is not None
+
+    @staticmethod
+    def discard(name: str) -> None:
+        """Stop using a format that failed to load (e.g. after an engine update)."""
+        FormatService._broken.add(name)
+
+    @staticmethod
+    def cleanup(tex_path, name: Optional[str]) -> None:
+        """Remove the per-document copies of the format and of the rewritten source."""
+        if name:
+            for local in (
+                pathOfPathLib(tex_path).parent / f"{name}.fmt",
+                FormatService.source(tex_path),
+            ):
+                if local.exists():
+                    local.unlink()
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    @staticmethod
+    def _split_preamble(source: str):
+        """
+        Returns (head, rest): `head` is the \\documentclass line plus every
+        preloadable \\usepackage line of the preamble, in order; `rest` is the
+        original document without its \\documentclass line. (None, None) if the
+        document has nothing worth precompiling.
+        """
+        lines = source.splitlines(keepends=True)
+        doc_class = None
+        head = []
+        for index, line in enumerate(lines):
+            stripped = line.split("%", 1)[0]
+            if "\\begin{document}" in stripped:
+                break
+            if doc_class is None:
+                if stripped.lstrip().startswith("\\documentclass"):
+                    doc_class = index
+                continue
+            match = FormatService.USEPACKAGE_PATTERN.match(stripped)
+            if match and all(
+                pkg.strip() in FormatService.PRELOADABLE
+                for pkg in match.group(2).split(",")
+            ):
+                head.append(stripped.rstrip() + "\n")
+
+        if doc_class is None or not head:
+            return None, None
+        head_text = lines[doc_class].split("%", 1)[0].rstrip() + "\n" + "".join(head)
+        rest = "".join(lines[:doc_class] + lines[doc_class + 1:])
+        return head_text, rest
+
+    @staticmethod
+    async def _engine() -> Optional[str]:
+        if FormatService._engine_version is None:
+            try:
+                proc = await asyncio.to_thread(
+                    subprocess.run,
+                    ["xelatex", "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                )
+                FormatService._engine_version = proc.stdout.splitlines()[0] if proc.stdout else ""
+            except (OSError, subprocess.TimeoutExpired):
+                return None
+        return FormatService._engine_version
+
+    @staticmethod
+    async def _build(name: str, head: str) -> Optional[pathOfPathLib]:
+        fmt_file = FormatService.FORMAT_DIR / f"{name}.fmt"
+        if fmt_file.exists():
+            return fmt_file
+
+        lock = FormatService._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if fmt_file.exists():
+                return fmt_file
+            FormatService.FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+            source = FormatService.FORMAT_DIR / f"{name}.tex"
+            source.write_text(
+                f"{head}{FormatService.DUMP_MARKER}\n\\begin{{document}}\n\\end{{document}}\n",
+                encoding="utf-8",
+            )
+            # Same invocation as mylatexformat's documentation:
+            #   xelatex -ini -jobname=<name> "&xelatex" mylatexformat.ltx <name>.tex
+            from Apps.services.compile_service import CompileService
+
+            returncode, _ = await CompileService.run_command(
+                [
+                    "xelatex",
+                    "-ini",
+                    "-interaction=nonstopmode",
+                    f"-jobname={name}",
+                    "&xelatex",
+                    "mylatexformat.ltx",
+                    source.name,
+                ],
+                FormatService.FORMAT_DIR,
+                Config.LATEX_TIMEOUT,
+            )
+            if returncode != 0 or not fmt_file.exists():
+                print(f"[WARN] Could not precompile LaTeX format {name}; compiling without it")
+                FormatService._broken.add(name)
+                return None
+            print(f"[INFO] Precompiled LaTeX format {name}")
+            return fmt_file
@@ -1,44 +1,67 @@
-from Apps.library_import import json, Dict, Any, re
+from Apps.config import Config
+from Apps.library_import import Dict, Any, Optional, List, re
 from Apps.library_import import pathOfPathLib
+from Apps.services.storage_service import build_store
 
 
 class IOService:
     """Service class for handling I/O operations of journal data."""
 
     # ==========================
-    # 🧩 Input Data Handling
+    # 🗄️ Storage Backends
     # ==========================
     DB_DIR = pathOfPathLib(__file__).resolve().parent.parent / "DB"
     DB_DIR.mkdir(parents=True, exist_ok=True)
 
     INPUT_FILE = DB_DIR / "journalDBInput.json"
     OUTPUT_FILE = DB_DIR / "journalDBOutput.json"
+    STORE_FILE = DB_DIR / "journalDB.sqlite3"
+
+    INPUT_STORE = build_store(Config.JOURNAL_STORE, INPUT_FILE, STORE_FILE, "journal_input")
+    OUTPUT_STORE = build_store(Config.JOURNAL_STORE, OUTPUT_FILE, STORE_FILE, "journal_output")
+
+    # ==========================
+    # 🧩 Input Data Handling
+    # ==========================
 
     @staticmethod
     def fetchInputData() -> Dict[str, Any]:
         """
-        Fetch input journal data from `journalDBInput.json`.
-        Returns an empty dict if the file is missing or invalid.
+        Fetch all input journal records.
+        Returns an empty dict if nothing is stored yet.
         """
-        if not IOService.INPUT_FILE.exists():
-            return {}
-
-        try:
-            with open(IOService.INPUT_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                return data if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        return IOService.INPUT_STORE.fetch_all()
 
     @staticmethod
     def saveInputData(data: Dict[str, Any]) -> None:
         """
-        Save input journal data to `journalDBInput.json`.
-        Overwrites the file each time.
+        Replace all input journal records with `data`.
+        Prefer `upsertInputData` / `deleteInputData` for single-journal changes.
         """
-        data = data or {}
-        with open(IOService.INPUT_FILE, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4, ensure_ascii=False, default=str)
+        IOService.INPUT_STORE.replace_all(data or {})
+
+    @staticmethod
+    def fetchInputById(journal_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one input journal record, or None if it doesn't exist."""
+        return IOService.INPUT_STORE.fetch(journal_id)
+
+    @staticmethod
+    def inputExists(journal_id: str) -> bool:
+        return IOService.INPUT_STORE.exists(journal_id)
+
+    @staticmethod
+    def listInputIds() -> List[str]:
+        return IOService.INPUT_STORE.list_ids()
+
+    @staticmethod
+    def upsertInputData(journal_id: str, record: Dict[str, Any]) -> None:
+        """Insert or update a single input journal record."""
+        IOService.INPUT_STORE.upsert(journal_id, record)
+
+    @staticmethod
+    def deleteInputData(journal_id: str) -> bool:
+        """Delete a single input journal record. Returns False if it wasn't there."""
+        return IOService.INPUT_STORE.delete(journal_id)
 
     # ==========================
     # 📤 Output Data Handling
@@ -47,28 +70,36 @@ class IOService:
     @staticmethod
     def fetchOutputData() -> Dict[str, Any]:
         """
-        Fetch output journal data from `journalDBOutput.json`.
-        Returns an empty dict if the file is missing or invalid.
+        Fetch all output journal records.
+        Returns an empty dict if nothing is stored yet.
         """
-        if not IOService.OUTPUT_FILE.exists():
-            return {}
-
-        try:
-            with open(IOService.OUTPUT_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                return data if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        return IOService.OUTPUT_STORE.fetch_all()
 
     @staticmethod
     def saveOutputData(data: Dict[str, Any]) -> None:
         """
-        Save output journal data to `journalDBOutput.json`.
-        Overwrites the file each time.
+        Replace all output journal records with `data`.
+        Prefer `upsertOutputData` for single-journal changes.
         """
-        data = data or {}
-        with open(IOService.OUTPUT_FILE, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4, ensure_ascii=False, default=str)
+        IOService.OUTPUT_STORE.replace_all(data or {})
+
+    @staticmethod
+    def fetchOutputById(journal_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one output journal record, or None if it doesn't exist."""
+        return IOService.OUTPUT_STORE.fetch(journal_id)
+
+    @staticmethod
+    def listOutputIds() -> List[str]:
+        return IOService.OUTPUT_STORE.list_ids()
+
+    @staticmethod
+    def upsertOutputData(journal_id: str, record: Dict[str, Any]) -> None:
+        """Insert or update a single output journal record."""
+        IOService.OUTPUT_STORE.upsert(journal_id, record)
+
+    @staticmethod
+    def deleteOutputData(journal_id: str) -> bool:
+        return IOService.OUTPUT_STORE.delete(journal_id)
 
     # ==========================
     # 🧠 Text Utilities
@@ -0,0 +1,177 @@
+# File: Apps/services/job_service.py
+from Apps.config import Config
+from Apps.library_import import asyncio, uuid, time, deque, HTTPException, Dict, Any, Optional
+from Apps.models_journal import PulsusInputStr
+from Apps.services.io_service import IOService
+from Apps.services.pipeline_service import PipelineService
+from collections import OrderedDict
+
+
+class JobService:
+    """
+    Bounded background queue for full journal pipeline runs.
+
+    Jobs are accepted by `enqueue`, executed by a fixed pool of worker tasks
+    and polled through `get`. Progress events reported by
+    `PipelineService.process_journal` are recorded on the job.
+    """
+
+    WORKERS = Config.JOB_WORKERS
+    QUEUE_SIZE = Config.JOB_QUEUE_SIZE
+    MAX_FINISHED_JOBS = Config.JOB_HISTORY_SIZE
+
+    jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _queue: Optional[asyncio.Queue] = None
+    # Ids of the jobs waiting in `_queue`, in queue order (for `queue_position`)
+    _queued: deque = deque()
+    _workers: list = []
+
+    # ==========================
+    # 🔁 Lifecycle
+    # ==========================
+    @staticmethod
+    async def start() -> None:
+        """Create the queue and spawn the worker tasks (called on app startup)."""
+        if JobService._queue is not None:
+            return
+        JobService._queue = asyncio.Queue(maxsize=JobService.QUEUE_SIZE)
+        JobService._workers = [
+            asyncio.create_task(JobService._worker(n))
+            for n in range(JobService.WORKERS)
+        ]
+        print(f"[INFO] Job queue started with {JobService.WORKERS} workers")
+
+    @staticmethod
+    async def stop() -> None:
+        """Cancel the worker tasks (called on app shutdown)."""
+        for task in JobService._workers:
+            task.cancel()
+        await asyncio.gather(*JobService._workers, return_exceptions=True)
+        JobService._workers = []
+        JobService._queue = None
+        JobService._queued.clear()
+
+    # ==========================
+    # 📥 Submission & Status
+    # ==========================
+    @staticmethod
+    async def enqueue(journal: PulsusInputStr) -> Dict[str, Any]:
+        """
+        Queue a journal for the full pipeline.
+        Raises 400 for duplicate journal IDs and 503 when the queue is full.
+        """
+        await JobService.start()
+
+        journal.id = journal.id.strip()
+        if IOService.inputExists(journal.id) or any(
+            job["journal_id"] == journal.id and job["status"] in ("queued", "running")
+            for job in JobService.jobs.values()
+        ):
+            raise HTTPException(status_code=400, detail="Journal ID already exists.")
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "journal_id": journal.id,
+            "status": "queued",
+            "step": None,
+            "message": "Waiting for a free worker",
+            "events": [],
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        try:
+            JobService._queue.put_nowait((job_id, journal))
+            JobService._queued.append(job_id)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Pipeline queue is full ({JobService.QUEUE_SIZE} jobs). Retry later.",
+                headers={"Retry-After": "30"},
+            )
+
+        JobService.jobs[job_id] = job
+        JobService._trim_history()
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> Dict[str, Any]:
+        job = JobService.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {**job, "queue_position": JobService._queue_position(job_id)}
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in JobService.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "workers": JobService.WORKERS,
+            "queue_size": JobService.QUEUE_SIZE,
+            "queue_depth": JobService._queue.qsize() if JobService._queue else 0,
+            "jobs": counts,
+        }
+
+    # ==========================
+    # ⚙️ Workers
+    # ==========================
+    @staticmethod
+    async def _worker(worker_no: int) -> None:
+        while True:
+            job_id, journal = await JobService._queue.get()
+            JobService._queued.remove(job_id)
+            job = JobService.jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                job["message"] = f"Picked up by worker {worker_no}"
+
+                def progress(step: str, message: str, job=job) -> None:
+                    job["step"] = step
+                    job["message"] = message
+                    job["events"].append(
+                        {"step": step, "message": message, "time": time.time()}
+                    )
+
+                job["result"] = await PipelineService.process_journal(
+                    journal, progress=progress
+                )
+                job["status"] = "succeeded"
+            except asyncio.CancelledError:
+                if job is not None:
+                    job["status"] = "cancelled"
+                raise
+            except HTTPException as e:
+                job["status"] = "failed"
+                job["error"] = {"status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = {"status_code": 500, "detail": str(e)}
+            finally:
+                if job is not None:
+                    job["finished_at"] = time.time()
+                JobService._queue.task_done()
+
+    @staticmethod
+    def _queue_position(job_id: str) -> Optional[int]:
+        try:
+            return JobService._queued.index(job_id) + 1
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _trim_history() -> None:
+        finished = [
+            job_id
+            for job_id, job in JobService.jobs.items()
+            if job["status"] in ("succeeded", "failed", "cancelled")
+        ]
+        for job_id in finished[: max(0, len(finished) - JobService.MAX_FINISHED_JOBS)]:
+            del JobService.jobs[job_id]
@@ -0,0 +1,128 @@
+# File: Apps/services/json_repair.py
+from Apps.library_import import json, re, Any
+
+
+class JsonRepair:
+    """
+    Tolerant JSON extraction for LLM output.
+
+    `loads` first parses the document strictly, ignoring markdown fences
+    and any text around it. Only if that fails does it run `repair`, a
+    single scan that:
+
+    - escapes raw control characters, stray quotes and invalid backslash
+      escapes inside strings;
+    - drops trailing commas before `}` / `]`;
+    - stops at the bracket that closes the document;
+    - recovers a truncated document by cutting it back to the last complete
+      member and closing the open brackets.
+
+    A cut-off answer therefore still yields everything before the cut, and
+    schema validation can ask for just the missing part.
+    """
+
+    FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+    VALID_ESCAPES = set('"\\/bfnrtu')
+    CLOSERS = {"{": "}", "[": "]"}
+
+    @staticmethod
+    def loads(text: str) -> Any:
+        """Parse model output as JSON; raises json.JSONDecodeError if nothing can be recovered."""
+        candidate = JsonRepair.extract(text)
+        try:
+            return json.JSONDecoder().raw_decode(candidate)[0]
+        except json.JSONDecodeError as e:
+            error = e
+        try:
+            value = json.loads(JsonRepair.repair(candidate))
+        except json.JSONDecodeError:
+            raise error
+        print(f"[WARN] Repaired malformed JSON from the model ({error.msg})")
+        return value
+
+    @staticmethod
+    def extract(text: str) -> str:
+        """The JSON part of `text`: the first fenced block if any, from its first `{` / `[`."""
+        fence = JsonRepair.FENCE_PATTERN.search(text)
+        if fence:
+            text = fence.group(1)
+        starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+        return text[min(starts):].strip() if starts else text.strip()
+
+    @staticmethod
+    def repair(text: str) -> str:
+        """Best-effort rewrite of a broken JSON document (see class docstring)."""
+        out = []
+        stack = []
+        # (length of `out`, open brackets) at the last point where the document could be closed
+        safe = (0, [])
+        in_string = False
+        i, n = 0, len(text)
+
+        while i < n:
+            ch = text[i]
+            if in_string:
+                if ch == "\\":
+                    nxt = text[i + 1] if i + 1 < n else ""
+                    if nxt in JsonRepair.VALID_ESCAPES and nxt:
+                        out.append(ch + nxt)
+                        i += 2
+                        continue
+                    out.append("\\\\")  # e.g. a LaTeX command: keep the backslash literally
+                elif ch == '"':
+                    follower = JsonRepair._next_char(text, i + 1)
+                    if follower in ("", ",", ":", "}", "]"):
+                        in_string = False
+                        out.append(ch)
+                        if follower != ":":  # a complete value, not a key
+                            safe = (len(out), list(stack))
+                    else:
+                        out.append('\\"')  # a quote inside the text
+                elif ch < " ":
+                    out.append({"\n": "\\n", "\r": "\\r", "\t": "\\t"}.get(ch, " "))
+                else:
+                    out.append(ch)
+            elif ch == '"':
+                in_string = True
+                out.append(ch)
+            elif ch in JsonRepair.CLOSERS:
+                stack.append(ch)
+                out.append(ch)
+                safe = (len(out), list(stack))
+            elif ch in "}]":
+                JsonRepair._strip_trailing_comma(out)
+                if stack:
+                    stack.pop()
+                out.append(ch)
+                if not stack:
+                    return "".join(out)  # ignore anything after the document
+                safe = (len(out), list(stack))
+            elif ch == ",":
+                JsonRepair._strip_trailing_comma(out)
+                safe = (len(out), list(stack))
+                out.append(ch)
+            else:
+                out.append(ch)
+            i += 1
+
+        # Truncated: keep the complete members only, then close what is still open
+        length, open_brackets = safe
+        repaired = out[:length]
+        JsonRepair._strip_trailing_comma(repaired)
+        return "".join(repaired) + "".join(JsonRepair.CLOSERS[b] for b in reversed(open_brackets))
+
+    @staticmethod
+    def _next_char(text: str, pos: int) -> str:
+        """First non-blank character from `pos` ("" at the end). A quote only ends a
+        string when this fits JSON: `,` `:` `}` `]` or the end of the text."""
+        while pos < len(text) and text[pos] in " \t\r\n":
+            pos += 1
+        return text[pos] if pos < len(text) else ""
+
+    @staticmethod
+    def _strip_trailing_comma(out: list) -> None:
+        j = len(out) - 1
+        while j >= 0 and out[j] in (" ", "\t", "\r", "\n"):
+            j -= 1
+        if j >= 0 and out[j] == ",":
+            del out[j]
@@ -0,0 +1,289 @@
+# File: Apps/services/llm_providers.py
+from Apps.config import Config
+from Apps.library_import import asyncio, hashlib, json, random, threading, time
+from Apps.library_import import BaseModel, Dict, Any, Optional, get_args, get_origin
+from Apps.library_import import ABC, abstractmethod
+
+
+class LLMProvider(ABC):
+    """
+    One text-generation backend behind a common interface:
+
+    - `generate(prompt, config)` (blocking, for sync routes),
+    - `agenerate(prompt, config)` (async),
+    - `open_stream(prompt)`, an async generator of text chunks; closing it
+      closes the upstream stream.
+
+    `config` uses the google-genai keys the services already send
+    (`response_mime_type`, `response_schema` as a Pydantic model); each
+    provider maps them to its own API. Clients are created on first use, so
+    an unused provider needs no API key.
+
+    Providers are shared per (name, model) via `LLMProvider.get`, which also
+    applies the LLM_PROVIDER override (e.g. "fake" for offline load tests).
+    """
+
+    name = ""
+    DEFAULT_MODEL = ""
+
+    _registry: Dict[tuple, "LLMProvider"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or self.DEFAULT_MODEL
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0}
+
+    @staticmethod
+    def get(name: str, model: Optional[str] = None) -> "LLMProvider":
+        """The shared provider `name` ("gemini", "groq", "fake") for `model`."""
+        if Config.LLM_PROVIDER and Config.LLM_PROVIDER != name:
+            # A fake keeps the requested model name, so its metrics and cache keys stay apart
+            name, model = Config.LLM_PROVIDER, model if Config.LLM_PROVIDER == "fake" else None
+        providers = {"gemini": GeminiProvider, "groq": GroqProvider, "fake": FakeProvider}
+        if name not in providers:
+            raise ValueError(f"Unknown LLM provider '{name}' (expected one of: {', '.join(providers)})")
+        key = (name, model)
+        provider = LLMProvider._registry.get(key)
+        if provider is None:
+            with LLMProvider._registry_lock:
+                provider = LLMProvider._registry.get(key)
+                if provider is None:
+                    provider = LLMProvider._registry[key] = providers[name](model)
+        return provider
+
+    @staticmethod
+    def all_metrics() -> Dict[str, Any]:
+        return {
+            f"{provider.name}:{provider.model}": provider.metrics()
+            for provider in LLMProvider._registry.values()
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+    # ==========================
+    # 🤖 Generation
+    # ==========================
+    @abstractmethod
+    def generate(self, prompt: str, config: Optional[dict] = None) -> str:
+        """The model's answer to `prompt` (blocking)."""
+
+    @abstractmethod
+    async def agenerate(self, prompt: str, config: Optional[dict] = None) -> str:
+        """The model's answer to `prompt`."""
+
+    @abstractmethod
+    async def open_stream(self, prompt: str):
+        """Start generating; returns an async generator of text chunks."""
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    def _count(self) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+
+    async def _texts(self, stream, text_of):
+        """Text chunks of an SDK stream; closing this generator closes `stream`."""
+        try:
+            async for chunk in stream:
+                text = text_of(chunk)
+                if text:
+                    yield text
+        finally:
+            close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+            if close is not None:
+                await close()
+
+
+class GeminiProvider(LLMProvider):
+    """google-genai models (or the GEMINI_REPLAY record/replay client)."""
+
+    name = "gemini"
+    DEFAULT_MODEL = "gemini-2.5-flash"
+
+    def __init__(self, model: Optional[str] = None):
+        super().__init__(model)
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = Config.init_gemini()
+        return self._client
+
+    def generate(self, prompt: str, config: Optional[dict] = None) -> str:
+        self._count()
+        response = self.client.models.generate_content(
+            model=self.model, contents=prompt, config=config
+        )
+        return response.text
+
+    async def agenerate(self, prompt: str, config: Optional[dict] = None) -> str:
+        self._count()
+        response = await self.client.aio.models.generate_content(
+            model=self.model, contents=prompt, config=config
+        )
+        return response.text
+
+    async def open_stream(self, prompt: str):
+        self._count()
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model, contents=prompt
+        )
+        return self._texts(stream, lambda chunk: chunk.text)
+
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions. A JSON `config` becomes Groq's JSON mode (no schemas)."""
+
+    name = "groq"
+    DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+    def __init__(self, model: Optional[str] = None):
+        super().__init__(model)
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = Config.init_groq()
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = Config.init_async_groq()
+        return self._async_client
+
+    def generate(self, prompt: str, config: Optional[dict] = None) -> str:
+        self._count()
+        response = self.client.chat.completions.create(**self._request(prompt, config))
+        return response.choices[0].message.content
+
+    async def agenerate(self, prompt: str, config: Optional[dict] = None) -> str:
+        self._count()
+        response = await self.async_client.chat.completions.create(**self._request(prompt, config))
+        return response.choices[0].message.content
+
+    async def open_stream(self, prompt: str):
+        self._count()
+        stream = await self.async_client.chat.completions.create(
+            **self._request(prompt, None), stream=True
+        )
+        return self._texts(
+            stream, lambda chunk: chunk.choices[0].delta.content if chunk.choices else None
+        )
+
+    def _request(self, prompt: str, config: Optional[dict]) -> dict:
+        request = {"model": self.model, "messages": [{"role": "user", "content": prompt}]}
+        if config and config.get("response_mime_type") == "application/json":
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+
+class FakeProviderError(Exception):
+    """Injected upstream failure of the fake provider (FAKE_LLM_ERROR_RATE)."""
+
+    status_code = 503  # transient: exercises RetryPolicy and the circuit breaker
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic offline stand-in for load tests (LLM_PROVIDER=fake).
+
+    The answer depends only on the prompt: plain text for plain prompts, and
+    for a `response_schema` a JSON document that validates against it (the
+    pipeline's references and sections). Each call waits FAKE_LLM_LATENCY
+    ± FAKE_LLM_JITTER seconds and fails with `FakeProviderError` at
+    FAKE_LLM_ERROR_RATE; both draw from one RNG seeded with FAKE_LLM_SEED,
+    so a run is reproducible at a given concurrency.
+    """
+
+    name = "fake"
+    DEFAULT_MODEL = "fake-llm"
+    WORDS = (
+        "analysis method results sample model energy structure synthesis study data "
+        "performance material process system effect response design theory signal "
+        "network measurement evidence approach protocol stability review"
+    ).split()
+
+    def __init__(self, model: Optional[str] = None):
+        super().__init__(model)
+        self.latency = Config.FAKE_LLM_LATENCY
+        self.jitter = Config.FAKE_LLM_JITTER
+        self.error_rate = Config.FAKE_LLM_ERROR_RATE
+        self._rng = random.Random(Config.FAKE_LLM_SEED)
+        self._stats["errors"] = 0
+
+    def generate(self, prompt: str, config: Optional[dict] = None) -> str:
+        time.sleep(self._next_delay())
+        return self.answer(prompt, config)
+
+    async def agenerate(self, prompt: str, config: Optional[dict] = None) -> str:
+        await asyncio.sleep(self._next_delay())
+        return self.answer(prompt, config)
+
+    async def open_stream(self, prompt: str):
+        delay = self._next_delay()
+        text = self.answer(prompt, None)
+
+        async def chunks():
+            await asyncio.sleep(delay)
+            words = text.split(" ")
+            for i in range(0, len(words), 8):
+                yield " ".join(words[i:i + 8]) + (" " if i + 8 < len(words) else "")
+                await asyncio.sleep(0)
+
+        return chunks()
+
+    def answer(self, prompt: str, config: Optional[dict] = None) -> str:
+        """The deterministic answer to `prompt` (no latency or injected errors)."""
+        seed = hashlib.sha256(f"{self.model}\n{prompt}".encode("utf-8")).hexdigest()
+        schema = (config or {}).get("response_schema")
+        if schema is not None:
+            return json.dumps(self._sample(schema, seed), ensure_ascii=False)
+        if (config or {}).get("response_mime_type") == "application/json":
+            return "{}"
+        return self._sentence(seed, 60) + "."
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    def _next_delay(self) -> float:
+        """Count the call, draw its latency, and raise the injected failure if drawn."""
+        with self._lock:
+            self._stats["calls"] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if self._rng.random() < self.error_rate:
+                self._stats["errors"] += 1
+                raise FakeProviderError(f"Injected failure from fake model {self.model}")
+        return delay
+
+    def _sentence(self, seed: str, words: int) -> str:
+        rng = random.Random(seed)
+        text = " ".join(rng.choice(self.WORDS) for _ in range(words))
+        return text[0].upper() + text[1:]
+
+    def _sample(self, annotation, seed: str):
+        """A value of type `annotation` (Pydantic model, str, number, list, dict)."""
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return {
+                name: self._sample(field.annotation, f"{seed}.{name}")
+                for name, field in annotation.model_fields.items()
+            }
+        origin, args = get_origin(annotation), get_args(annotation)
+        if origin in (list, tuple, set):
+            return [self._sample(args[0] if args else str, f"{seed}.{i}") for i in range(2)]
+        if origin is dict:
+            return {"C001": self._sample(args[1] if len(args) > 1 else str, f"{seed}.C001")}
+        if args:  # Optional[X] / Union: the first non-None member
+            return self._sample(next(a for a in args if a is not type(None)), seed)
+        if annotation is bool:
+            return True
+        if annotation in (int, float):
+            return 2000 + int(seed[:4], 16) % 25
+        return self._sentence(seed, 12)
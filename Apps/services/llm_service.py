@@ -1,63 +1,255 @@
 from Apps.config import Config
-from Apps.library_import import HTTPException, httpx
+from Apps.library_import import HTTPException, httpx, asyncio, Optional, HTTP2_AVAILABLE
 from Apps.models_journal import ArticleItem
+from Apps.services.retry_policy import RetryPolicy
+from Apps.services.upstream_guard import UpstreamGuard, CircuitOpenError
+from Apps.services.rate_limiter import RateLimiter
+from Apps.services.response_cache import ResponseCache
+from Apps.services.llm_providers import LLMProvider
 
 class LLMService:
 
-    gem_client, groq_client, CORE_API_KEY = Config.init_clients()
+    CORE_API_KEY = Config.CORE_API_KEY
     CORE_API_URL = "https://api.core.ac.uk/v3/search/works"
 
+    GEMINI_RETRY = RetryPolicy(
+        "Gemini", attempts=Config.LLM_RETRY_ATTEMPTS, max_delay=20.0, deadline=Config.LLM_RETRY_DEADLINE
+    )
+    GROQ_RETRY = RetryPolicy(
+        "Groq", attempts=Config.LLM_RETRY_ATTEMPTS, max_delay=20.0, deadline=Config.LLM_RETRY_DEADLINE
+    )
+    CORE_RETRY = RetryPolicy("CORE", attempts=3, max_delay=8.0, deadline=45.0)
+
+    # Backends of /llm/ask-gemini and /llm/ask-groq (all "fake" with LLM_PROVIDER=fake)
+    GEMINI = LLMProvider.get("gemini", Config.GEMINI_MODEL)
+    GROQ = LLMProvider.get("groq", Config.GROQ_MODEL)
+
+    GEMINI_GUARD = UpstreamGuard.get(GEMINI.name)
+    GROQ_GUARD = UpstreamGuard.get(GROQ.name)
+    CORE_GUARD = UpstreamGuard.get("core")
+
+    GEMINI_LIMIT = RateLimiter.get(GEMINI.name)
+    GROQ_LIMIT = RateLimiter.get(GROQ.name)
+
+    CORE_HTTP2 = Config.CORE_HTTP2 and HTTP2_AVAILABLE
+
+    CORE_CACHE = ResponseCache.get(
+        "core_search",
+        Config.CORE_CACHE_MAX_ENTRIES,
+        Config.CORE_CACHE_TTL,
+        ResponseCache.DB_FILE if Config.CORE_CACHE_PERSIST else None,
+    )
+
+    # Opt-in (LLM_CACHE_ENABLED=1); shared with PipelineService
+    LLM_CACHE = ResponseCache.get(
+        "llm",
+        Config.LLM_CACHE_MAX_ENTRIES if Config.LLM_CACHE_ENABLED else 0,
+        Config.LLM_CACHE_TTL,
+        ResponseCache.DB_FILE if Config.LLM_CACHE_ENABLED else None,
+    )
+
+    _core_client: Optional[httpx.AsyncClient] = None
+    _core_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ==========================
+    # 🔁 Lifecycle
+    # ==========================
+    @staticmethod
+    async def start() -> None:
+        """Open the shared CORE client on the running loop (idempotent)."""
+        LLMService.core_client()
+        print(f"[INFO] CORE client started (HTTP/2: {LLMService.CORE_HTTP2})")
+
     @staticmethod
-    def process_gemini(prompt: str) -> str:
-        """Send prompt to Gemini and return model response."""
+    async def stop() -> None:
+        client = LLMService._core_client
+        LLMService._core_client = None
+        LLMService._core_loop = None
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def core_client() -> httpx.AsyncClient:
+        """
+        The pooled, keep-alive client used for every CORE call. Opened by the
+        app lifespan; created lazily for callers running outside the server
+        (batch CLI) or on another event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if LLMService._core_client is None or LLMService._core_loop is not loop:
+            LLMService._core_loop = loop
+            LLMService._core_client = httpx.AsyncClient(
+                http2=LLMService.CORE_HTTP2,
+                timeout=Config.CORE_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=Config.CORE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.CORE_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=Config.CORE_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return LLMService._core_client
+
+    # ==========================
+    # 🤖 Providers
+    # ==========================
+    @staticmethod
+    def process_gemini(prompt: str, use_cache: bool = True) -> str:
+        """
+        Send prompt to Gemini and return model response.
+        Answers come from `LLM_CACHE` when enabled; `use_cache=False` forces a fresh one.
+        """
+
+        def attempt():
+            LLMService.GEMINI_LIMIT.acquire_sync(prompt)
+            return LLMService.GEMINI_GUARD.call_sync(LLMService.GEMINI.generate, prompt)
+
         try:
-            response = LLMService.gem_client.models.generate_content(
-                model="gemini-2.5-flash", contents=prompt
+            return LLMService.LLM_CACHE.get_or_fetch_sync(
+                ResponseCache.key(LLMService.GEMINI.name, LLMService.GEMINI.model, prompt, None),
+                lambda: LLMService.GEMINI_RETRY.run_sync(attempt),
+                refresh=not use_cache,
             )
-            return getattr(response, "text", str(response))
+        except CircuitOpenError as e:
+            raise LLMService._unavailable(e)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Gemini API error: {str(e)}")
 
     @staticmethod
-    def process_groq(prompt: str) -> str:
-        """Send prompt to Groq API and return model response."""
+    def process_groq(prompt: str, use_cache: bool = True) -> str:
+        """
+        Send prompt to Groq API and return model response.
+        Answers come from `LLM_CACHE` when enabled; `use_cache=False` forces a fresh one.
+        """
+
+        def attempt():
+            LLMService.GROQ_LIMIT.acquire_sync(prompt)
+            return LLMService.GROQ_GUARD.call_sync(LLMService.GROQ.generate, prompt)
+
         try:
-            response = LLMService.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
+            return LLMService.LLM_CACHE.get_or_fetch_sync(
+                ResponseCache.key(LLMService.GROQ.name, LLMService.GROQ.model, prompt, None),
+                lambda: LLMService.GROQ_RETRY.run_sync(attempt),
+                refresh=not use_cache,
             )
-            return response.choices[0].message.content
+        except CircuitOpenError as e:
+            raise LLMService._unavailable(e)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Groq API error: {str(e)}")
 
+    # ==========================
+    # 📡 Streaming
+    # ==========================
     @staticmethod
-    async def process_core_search(prompt: str) -> dict:
-        """Fetch scholarly articles from CORE API and structure results."""
-        headers = {
-            "Authorization": f"Bearer {LLMService.CORE_API_KEY}",
-            "Content-Type": "application/json",
-        }
-        data = {"q": prompt, "limit": 20}
+    async def stream_gemini(prompt: str):
+        """Yield Gemini's answer as text chunks, as the model produces them."""
+        async for text in LLMService._stream(
+            "Gemini", LLMService.GEMINI_LIMIT, LLMService.GEMINI_GUARD,
+            LLMService.GEMINI_RETRY, prompt, lambda: LLMService.GEMINI.open_stream(prompt),
+        ):
+            yield text
+
+    @staticmethod
+    async def stream_groq(prompt: str):
+        """Yield Groq's answer as text chunks, as the model produces them."""
+        async for text in LLMService._stream(
+            "Groq", LLMService.GROQ_LIMIT, LLMService.GROQ_GUARD,
+            LLMService.GROQ_RETRY, prompt, lambda: LLMService.GROQ.open_stream(prompt),
+        ):
+            yield text
+
+    @staticmethod
+    async def _stream(label, limit, guard, retry, prompt, open_stream):
+        """
+        Relay the text chunks of a provider stream while holding one `guard` slot.
+
+        Opening the stream, up to its first chunk, is retried by `retry`;
+        once chunks have been sent a failure ends the stream instead, since
+        a retry would repeat text. When the consumer stops early (client
+        disconnected), the upstream stream is closed so generation stops.
+        """
+
+        async def start():
+            await limit.acquire(prompt)
+            stream = await open_stream()
+            chunks = stream.__aiter__()
+            try:
+                return stream, chunks, await chunks.__anext__()
+            except StopAsyncIteration:
+                return stream, chunks, None
+            except BaseException:
+                await LLMService._close_stream(stream)
+                raise
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    LLMService.CORE_API_URL, json=data, headers=headers
-                )
-                response.raise_for_status()
-                results = response.json()
-                return LLMService._build_structured_content(results)
+            async with guard.slot():
+                stream, chunks, first = await retry.run(start)
+                try:
+                    if first is None:
+                        return
+                    yield first
+                    async for chunk in chunks:
+                        yield chunk
+                finally:
+                    await LLMService._close_stream(stream)
+        except CircuitOpenError as e:
+            raise LLMService._unavailable(e)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"{label} API error: {str(e)}")
+
+    @staticmethod
+    async def _close_stream(stream) -> None:
+        close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+        if close is not None:
+            await close()
+
+    @staticmethod
+    async def process_core_search(prompt: str, limit: int = 20) -> dict:
+        """
+        Fetch scholarly articles from CORE API and structure results.
+
+        Results are cached per normalized query and limit (`CORE_CACHE`), and
+        identical searches already in flight share one upstream request.
+        """
+        headers = {"Authorization": f"Bearer {LLMService.CORE_API_KEY}"}
+        query = " ".join(prompt.split())
+        data = {"q": query, "limit": limit}
+        client = LLMService.core_client()
+
+        async def search():
+            response = await client.post(LLMService.CORE_API_URL, json=data, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+        async def fetch():
+            results = await LLMService.CORE_RETRY.run(LLMService.CORE_GUARD.call, search)
+            return LLMService._build_structured_content(results)
+
+        try:
+            return await LLMService.CORE_CACHE.get_or_fetch(
+                ResponseCache.key(query.casefold(), limit), fetch
+            )
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=e.response.status_code,
                 detail=f"CORE API returned HTTP error: {e.response.text}",
             )
+        except CircuitOpenError as e:
+            raise LLMService._unavailable(e)
         except httpx.RequestError as e:
             raise HTTPException(status_code=500, detail=f"Request error: {str(e)}")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+    @staticmethod
+    def _unavailable(e: CircuitOpenError) -> HTTPException:
+        return HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+
     @staticmethod
     def _build_structured_content(results):
         """Format CORE API results into a structured content dict."""
@@ -96,6 +288,6 @@ class LLMService:
             }
 
             temp_item = ArticleItem(**content[key])
-            content[key] = temp_item.model_dump()
+            content[key] = temp_item.model_dump(mode="json")  # cacheable as JSON
 
         return {"content": content}
@@ -1,10 +1,21 @@
 from Apps.config import Config
 from Apps.services.io_service import IOService
-from Apps.models_journal import PulsusInputStr, PulsusOutputStr
+from Apps.services.compile_service import CompileService
+from Apps.services.artifact_cache import ArtifactCache
+from Apps.services.template_service import TemplateService
+from Apps.services.citation_service import CitationService
+from Apps.services.retry_policy import RetryPolicy
+from Apps.services.upstream_guard import UpstreamGuard, CircuitOpenError
+from Apps.services.rate_limiter import RateLimiter
+from Apps.services.response_cache import ResponseCache
+from Apps.services.stage_graph import StageGraph
+from Apps.services.json_repair import JsonRepair
+from Apps.services.llm_providers import LLMProvider
+from Apps.models_journal import PulsusInputStr, PulsusOutputStr, GeminiReferences, GeminiSections
 from Apps.language_fonts import LatexLanguageConfig
 from Apps.library_import import *
 from Apps.library_import import pathOfPathLib
-
+from contextlib import nullcontext
 
 
 class PipelineService:
@@ -12,10 +23,78 @@ class PipelineService:
     Handles the complete pipeline for journal processing and PDF generation.
     """
 
-    gemClient, GroqClient, CORE_API_KEY = Config.init_clients()
+    # Model writing the journal content (PIPELINE_PROVIDER / PIPELINE_MODEL, or LLM_PROVIDER=fake)
+    PROVIDER = LLMProvider.get(Config.PIPELINE_PROVIDER, Config.PIPELINE_MODEL or None)
+
+    LLM_RETRY = RetryPolicy(
+        PROVIDER.name.capitalize(),
+        attempts=Config.LLM_RETRY_ATTEMPTS,
+        max_delay=20.0,
+        deadline=Config.LLM_RETRY_DEADLINE,
+    )
+    LLM_GUARD = UpstreamGuard.get(PROVIDER.name)
+    LLM_LIMIT = RateLimiter.get(PROVIDER.name)
+    # Same opt-in cache as LLMService: a rerun after a failed PDF build reuses the answers
+    LLM_CACHE = ResponseCache.get(
+        "llm",
+        Config.LLM_CACHE_MAX_ENTRIES if Config.LLM_CACHE_ENABLED else 0,
+        Config.LLM_CACHE_TTL,
+        ResponseCache.DB_FILE if Config.LLM_CACHE_ENABLED else None,
+    )
+    # Regenerate when Gemini's answer holds no recoverable JSON at all
+    LLM_JSON_RETRY = RetryPolicy(
+        f"{PROVIDER.name.capitalize()} JSON",
+        attempts=3,
+        base_delay=0.5,
+        max_delay=4.0,
+        retry_on=lambda e: isinstance(e, json.JSONDecodeError),
+    )
+
+    # Rounds of "regenerate only the missing/invalid fields" before accepting an answer as is
+    SCHEMA_REPAIR_ROUNDS = 2
+    REFERENCE_COUNT = 10
+    # Part of the cached HTML's key: bump it whenever _render_html changes its output
+    HTML_RENDER_VERSION = "1"
+    # Response schemas sent to Gemini (GEMINI_STRUCTURED_OUTPUT), derived from models_journal
+    REFERENCES_SCHEMA = GeminiReferences.response_schema(REFERENCE_COUNT)
+
+    # Per-section instructions for PIPELINE_SECTION_MODE=parallel (same as the combined prompt)
+    SECTION_REQUIREMENTS = {
+        "introduction": """
+            - Word count: 500–700.
+            - Include sequential citation markers from the references: "C001" → [1], "C002" → [2], and so on.
+            - The Introduction must contain exactly 10 paragraphs, each corresponding to one reference.
+            - The citation marker must be placed at the end of the paragraph, immediately before the period, followed by two line breaks(\n).""",
+        "description": """
+            - Word count: 500–700.
+            - Include sequential citation markers from the references: "C001" → [1], "C002" → [2], and so on.
+            - The Description must also contain exactly 10 paragraphs, each corresponding to one reference.
+            - The citation marker must be placed at the end of the paragraph, immediately before the period, followed by two line breaks(\n).""",
+        "summary": """
+            - Word count: 150–300.
+            - Do not include citations (Strictly).
+            - Focus on key points from the content in a concise manner.""",
+        "abstract": """
+            - Word count: 90–100.
+            - Provide a brief summary of the content.
+            - No citations required.""",
+        "discussion": """
+            - Word count: 200–400.
+            - Include analysis, implications, or commentary derived from the content.
+            - Citation markers can be included in ascending order, one per paragraph, placed at the end and before the period.""",
+        "keywords": """
+            - Extract 5–10 keywords directly from the content.
+            - Keywords should be in Title Case and separated by semi-colon(;).""",
+    }
+    SECTION_SCHEMAS = {
+        section: create_model(f"Gemini{section.capitalize()}", **{section: (str, ...)})
+        for section in SECTION_REQUIREMENTS
+    }
 
     @staticmethod
-    async def process_journal(journal: PulsusInputStr):
+    async def process_journal(
+        journal: PulsusInputStr, progress=None, llm_limit=None, compile_limit=None
+    ):
         """
         Full journal pipeline:
         1. Save input
@@ -23,72 +102,127 @@ class PipelineService:
         3. Parse + clean content
         4. Generate PDF & HTML
         5. Return JSON status
+
+        `progress`, if given, is called as progress(step, message) after each step.
+        `llm_limit` / `compile_limit` are optional async context managers (e.g.
+        asyncio.Semaphore) held around the Gemini stages and the HTML/PDF build.
         """
         # ---------- Step 1: Store input ----------
-        IOService.INPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        data = IOService.fetchInputData()
         journal.id = journal.id.strip()
         journal.author = journal.author.strip()
-        if journal.id in data:
+        if IOService.inputExists(journal.id):
             raise HTTPException(status_code=400, detail="Journal ID already exists.")
-        data[journal.id] = journal.model_dump(exclude=["id"])
-        print("Step 1 : Save journal input ✔")
-
-        # ---------- Step 2: Build LLM Prompt ----------
-        prompt = PipelineService._build_prompt(journal)
-        print("Step 2 : Created universal prompt ✔")
-
-        # ---------- Step 3: Ask Gemini ----------
-        # gem_summary = PipelineService._ask_gemini_with_retries(prompt)
-        # print("Step 3 : Gemini response received ✔")
-
-        # ---------- Step 3,4: Meta data Parse LLM JSON ----------
-        content_data = PipelineService._parse_gemini_response(prompt)
-        print("Step 3,4 : Generation with Parsing the structured JSON ✔")
-
-        # ---------- Step 5: Create title, abstract, summary ----------
-        processed_sections = PipelineService._process_sections(content_data)
-        processed_sections = PipelineService._normalize_content_structure(
-            processed_sections
-        )
-        print("Step 5 : Generated summary/introduction/description ✔")
-
-        gem_title = PipelineService._generate_title(
-            processed_sections["content"]["summary"], journal
-        )
-        if gem_title[-1] == ".":
-            gem_title = gem_title[:-1]
+        PipelineService._report(progress, "1", "Save journal input")
 
-        print("Step 6 : Generated title ✔")
+        # ---------- Step 2-6: Gemini generation ----------
+        async with llm_limit or nullcontext():
+            content_data, processed_sections, gem_title = (
+                await PipelineService._generate_content(journal, progress)
+            )
 
         # ---------- Step 6: Save structured data ----------
         final_output = PipelineService._build_final_output(
             journal, gem_title, content_data, processed_sections["content"]
         )
-        IOService.saveInputData(data)
-        output_data = IOService.fetchOutputData()
+        IOService.upsertInputData(journal.id, journal.model_dump(exclude=["id"]))
         pulsus_output_instance = PulsusOutputStr(**final_output[journal.id])
-        output_data[journal.id] = pulsus_output_instance.model_dump()
+        output_data = {journal.id: pulsus_output_instance.model_dump()}
 
-        IOService.saveOutputData(output_data)
-        print("Step 7 : Saved output data ✔")
+        IOService.upsertOutputData(journal.id, output_data[journal.id])
+        PipelineService._report(progress, "7", "Saved output data")
 
         # ---------- Step 7: Generate files ----------
-        PipelineService._generate_html_and_pdf(journal, output_data)
-        print("Step 11 : Generated HTML and PDF ✔")
+        async with compile_limit or nullcontext():
+            await PipelineService._generate_html_and_pdf(journal, output_data, progress)
+        PipelineService._report(progress, "11", "Generated HTML and PDF")
 
         # ---------- Step 8: Return success ----------
-        return JSONResponse(
-            status_code=200,
-            content={
-                "Status": f"Data added and files generated successfully in PDFStorePulsus/{journal.id}/ ✔."
-            },
-        )
+        return {
+            "Status": f"Data added and files generated successfully in PDFStorePulsus/{journal.id}/ ✔."
+        }
+
+    @staticmethod
+    async def _generate_content(journal: PulsusInputStr, progress=None):
+        """
+        LLM part of the pipeline (steps 2-6), run as a `StageGraph`:
+
+            references ─┬─ introduction, description, discussion, abstract, keywords
+                        └─ summary ── title
+
+        With PIPELINE_SECTION_MODE=parallel every section is its own Gemini
+        call and they all run concurrently; the title only waits for the
+        summary. In "combined" mode one call writes all sections.
+        Returns (content_data, processed_sections, title).
+        """
+        # ---------- Step 2: Build LLM Prompt ----------
+        prompt = PipelineService._build_prompt(journal)
+        PipelineService._report(progress, "2", "Created universal prompt")
+        section_names = list(PipelineService.SECTION_REQUIREMENTS)
+
+        # ---------- Step 3,4: Meta data Parse LLM JSON ----------
+        async def references():
+            content_data = await PipelineService._parse_gemini_response(
+                prompt,
+                GeminiReferences,
+                required=[f"C{i:03d}" for i in range(1, PipelineService.REFERENCE_COUNT + 1)],
+                response_schema=PipelineService.REFERENCES_SCHEMA,
+            )
+            PipelineService._report(
+                progress, "3,4", "Generation with Parsing the structured JSON"
+            )
+            return content_data
+
+        # ---------- Step 5: Create summary, introduction, description... ----------
+        def section_stage(section):
+            async def stage(references):
+                text = await PipelineService._generate_section(section, references)
+                PipelineService._report(progress, "5", f"Generated {section}")
+                return text
+            return stage
+
+        async def all_sections(references):
+            processed = await PipelineService._process_sections(references)
+            PipelineService._report(
+                progress, "5", "Generated summary/introduction/description"
+            )
+            return processed["content"]
+
+        # ---------- Step 6: Create title (needs the summary only) ----------
+        async def title(summary):
+            gem_title = await PipelineService._generate_title(summary, journal)
+            if gem_title[-1] == ".":
+                gem_title = gem_title[:-1]
+            PipelineService._report(progress, "6", "Generated title")
+            return gem_title
+
+        graph = StageGraph().add("references", references)
+        if Config.PIPELINE_SECTION_MODE == "combined":
+            graph.add("sections", all_sections, "references")
+
+            async def summary(sections):
+                return sections["summary"]
+
+            graph.add("summary", summary, "sections")
+        else:
+            for section in section_names:
+                graph.add(section, section_stage(section), "references")
+        graph.add("title", title, "summary")
+        results = await graph.run()
+
+        section_texts = results.get("sections") or {s: results[s] for s in section_names}
+        return results["references"], {"content": section_texts}, results["title"]
 
     # =====================================================================================================================================
     # Internal helper methods
     # =====================================================================================================================================
 
+    @staticmethod
+    def _report(progress, step: str, message: str) -> None:
+        """Print a pipeline step and forward it to the optional progress callback."""
+        print(f"Step {step} : {message} ✔")
+        if progress is not None:
+            progress(step, message)
+
     @staticmethod
     def _build_prompt(journal: PulsusInputStr) -> str:
         return f"""
@@ -134,51 +268,173 @@ class PipelineService:
         """
 
     @staticmethod
-    def _ask_gemini_with_retries(prompt: str, retries: int = 10) -> str:
-        for attempt in range(retries):
-            try:
-                response = PipelineService.gemClient.models.generate_content(
-                    model="gemini-2.5-flash-lite",
-                    contents=prompt
-                    # config={
-                    #     "tools": [
-                    #         {
-                    #             "google_search": {}
-                    #         }
-                    #     ]
-                    # }
-                )
-                return response.text
-            except Exception as e:
-                print(f"Gemini attempt {attempt + 1} failed: {e}")
-                time.sleep(3)
-                if attempt == retries - 1:
-                    raise HTTPException(status_code=500, detail=str(e))
+    async def _ask_gemini_with_retries(
+        prompt: str, use_cache: bool = True, response_schema=None, json_mode: bool = False
+    ) -> str:
+        """
+        Ask Gemini (`PROVIDER`: another model with PIPELINE_PROVIDER, or the
+        offline fake) through the async client so the event loop stays free
+        while the model is generating. Every attempt waits for the provider's
+        rate limits, then goes through the shared concurrency limiter/circuit
+        breaker; transient failures are retried by `LLM_RETRY`.
+        Answers are served from `LLM_CACHE` when it is enabled, unless
+        `use_cache` is False (the fresh answer then replaces the cached one).
+
+        With GEMINI_STRUCTURED_OUTPUT, `response_schema` (a Pydantic model)
+        makes Gemini answer with JSON of exactly that shape, and `json_mode`
+        asks for JSON of any shape.
+        """
+        config = None
+        if Config.GEMINI_STRUCTURED_OUTPUT and (response_schema is not None or json_mode):
+            config = {"response_mime_type": "application/json"}
+            if response_schema is not None:
+                config["response_schema"] = response_schema
+        # tools such as {"google_search": {}} are not allowed together with JSON mode
+
+        async def ask() -> str:
+            return await PipelineService.PROVIDER.agenerate(prompt, config)
+
+        async def attempt() -> str:
+            await PipelineService.LLM_LIMIT.acquire(prompt)
+            return await PipelineService.LLM_GUARD.call(ask)
+
+        try:
+            return await PipelineService.LLM_CACHE.get_or_fetch(
+                ResponseCache.key(
+                    PipelineService.PROVIDER.name,
+                    PipelineService.PROVIDER.model,
+                    prompt,
+                    response_schema.model_json_schema() if response_schema else config,
+                ),
+                lambda: PipelineService.LLM_RETRY.run(attempt),
+                refresh=not use_cache,
+            )
+        except CircuitOpenError as e:
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
     @staticmethod
-    def _parse_gemini_response(prompt: str, retries: int = 10) -> dict:
+    async def _parse_gemini_response(
+        prompt: str, schema=None, required=(), response_schema=None
+    ) -> dict:
         """
         Generate Gemini response and parse JSON.
-        If parsing fails, retry up to `retries` times by regenerating Gemini output.
+
+        The answer goes through `JsonRepair`, so a stray comma, quote or a
+        cut-off tail does not cost a new generation. Only an answer without
+        any recoverable JSON is regenerated (`LLM_JSON_RETRY`, bypassing
+        the response cache so it is not served again).
+
+        With a `schema` (Pydantic model) and/or `required` keys under
+        "content", the parsed answer is validated and Gemini is asked for the
+        missing or invalid fields only (`SCHEMA_REPAIR_ROUNDS` times); they
+        are merged into the answer, which is returned normalized to
+        {"content": ...}.
+
+        Gemini is asked for structured output shaped like `response_schema`
+        (default: `schema`), so repairs are rarely needed.
         """
-        attempt = 0
-        while attempt < retries:
-            gem_response = PipelineService._ask_gemini_with_retries(prompt)
+        attempts = []
+
+        async def generate_and_parse() -> dict:
+            attempts.append(1)
+            gem_response = await PipelineService._ask_gemini_with_retries(
+                prompt,
+                use_cache=len(attempts) == 1,
+                response_schema=response_schema or schema,
+                json_mode=True,
+            )
+            parsed = JsonRepair.loads(gem_response)
+            if not isinstance(parsed, dict):
+                raise json.JSONDecodeError("Expected a JSON object", gem_response, 0)
+            return parsed
 
+        try:
+            data = await PipelineService.LLM_JSON_RETRY.run(generate_and_parse)
+        except json.JSONDecodeError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to parse Gemini JSON after {PipelineService.LLM_JSON_RETRY.attempts} attempts: {e}",
+            )
+        if schema is None and not required:
+            return data
+
+        data = PipelineService._normalize_content_structure(data)
+        for _ in range(PipelineService.SCHEMA_REPAIR_ROUNDS):
+            problems = PipelineService._schema_problems(data, schema, required)
+            if not problems:
+                return data
+            print(f"[INFO] Asking Gemini to redo {len(problems)} invalid field(s) only")
+            patch = await PipelineService._repair_fields(prompt, data, problems)
+            if not patch:
+                break
+            data = PipelineService._merge(
+                data, PipelineService._normalize_content_structure(patch)
+            )
+
+        problems = PipelineService._schema_problems(data, schema, required)
+        if problems:
+            print(f"[WARN] Gemini output still has invalid fields, using it as is: {problems[:5]}")
+        return data
+
+    @staticmethod
+    def _schema_problems(data: dict, schema=None, required=()) -> list:
+        """'path: message' for every field of `data` that is missing or invalid."""
+        problems = []
+        if schema is not None:
             try:
-                raw_json = IOService.extract_json_from_markdown(gem_response)
-                return json.loads(raw_json)
-
-            except json.JSONDecodeError as e:
-                attempt += 1
-                print(f"JSON parsing failed (attempt {attempt}/{retries}): {e}")
-                if attempt >= retries:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to parse Gemini JSON after {retries} attempts: {e}",
-                    )
-                print("Retrying Gemini generation...")
-                time.sleep(2)
+                schema.model_validate(data)
+            except ValidationError as e:
+                for error in e.errors(include_url=False):
+                    path = ".".join(str(part) for part in error["loc"])
+                    problems.append(f"{path}: {error['msg']}")
+        content = data.get("content")
+        if isinstance(content, dict):
+            problems += [f"content.{key}: Missing entry" for key in required if key not in content]
+        return problems
+
+    @staticmethod
+    async def _repair_fields(prompt: str, data: dict, problems: list) -> dict:
+        """Ask Gemini for the listed fields only; returns the partial JSON ({} if unusable)."""
+        listed = "\n".join(f"            - {problem}" for problem in problems)
+        repair_prompt = f"""
+            The JSON below was generated for the following instructions, but some fields are missing or invalid.
+
+            Instructions:
+            {prompt}
+
+            Current JSON:
+            {json.dumps(data, ensure_ascii=False)}
+
+            Missing or invalid fields:
+{listed}
+
+            IMPORTANT: Return ONLY a JSON object containing just these fields, nested exactly as in the
+            current JSON (for example {{"content": {{"C003": {{"DOI": "..."}}}}}}), and following the
+            original instructions. Do not repeat fields that are already valid. No additional text.
+            """
+        try:
+            patch = JsonRepair.loads(
+                await PipelineService._ask_gemini_with_retries(repair_prompt, json_mode=True)
+            )
+        except json.JSONDecodeError as e:
+            print(f"[WARN] Could not parse Gemini's field repair: {e}")
+            return {}
+        return patch if isinstance(patch, dict) else {}
+
+    @staticmethod
+    def _merge(base: dict, patch: dict) -> dict:
+        """Deep-merge `patch` into a copy of `base` (patch values win)."""
+        merged = dict(base)
+        for key, value in patch.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = PipelineService._merge(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
 
     @staticmethod
     def _normalize_content_structure(parsed_json: dict) -> dict:
@@ -194,7 +450,7 @@ class PipelineService:
         return {"content": parsed_json}
 
     @staticmethod
-    def _process_sections(content_data: dict) -> dict:
+    async def _process_sections(content_data: dict) -> dict:
         prompt = f"""
             You are given the following data: {content_data}
             You are also provided with reference details in the format: "C001", "C002", etc., where each reference contains full bibliographic information.
@@ -261,19 +517,64 @@ class PipelineService:
             - No introductory phrases, explanations, or meta-commentary.
             - Ensure all text is clean and compliant with JSON formatting.
             """
-        parsed = PipelineService._parse_gemini_response(prompt)
-        normalized = PipelineService._normalize_content_structure(parsed)
-        return normalized
+        return await PipelineService._parse_gemini_response(prompt, GeminiSections)
+
+    @staticmethod
+    async def _generate_section(section: str, content_data: dict) -> str:
+        """Write one article section (see `SECTION_REQUIREMENTS`) from the references."""
+        prompt = f"""
+            You are given the following data: {content_data}
+            You are also provided with reference details in the format: "C001", "C002", etc., where each reference contains full bibliographic information.
+
+            Your task is to write only the {section.capitalize()} section of an article based on this data, in JSON format. Follow these instructions carefully:
+
+            1. Output Structure
+            Produce only a valid JSON object with exactly this key:
+
+            {{"{section}": "..."}}
+
+            - Remove all special characters, escape sequences, and formatting symbols from the text.
+            - Keep only brackets, commas, periods, and characters necessary for JSON and citation markers.
+
+            2. Section Requirements
+            {PipelineService.SECTION_REQUIREMENTS[section]}
+
+            3. Writing Style
+            - Formal academic tone.
+            - Clear, concise sentences.
+            - Avoid corporate buzzwords, filler, or AI-sounding phrases.
+            - Use natural transitions and sentence variation.
+
+            4. JSON Output Rules
+            - Only return the JSON object.
+            - No introductory phrases, explanations, or meta-commentary.
+            - Ensure all text is clean and compliant with JSON formatting.
+            """
+        parsed = (
+            await PipelineService._parse_gemini_response(
+                prompt, required=[section], response_schema=PipelineService.SECTION_SCHEMAS[section]
+            )
+        )["content"]
+        if isinstance(parsed, dict):
+            if section in parsed:
+                return parsed[section]
+            # Model used another key: take its only text value
+            texts = [v for v in parsed.values() if isinstance(v, str)]
+            if len(texts) == 1:
+                return texts[0]
+        raise HTTPException(
+            status_code=500, detail=f"Gemini returned no '{section}' section: {str(parsed)[:200]}"
+        )
 
     @staticmethod
-    def _generate_title(summary: str, journal: PulsusInputStr) -> str:
+    async def _generate_title(summary: str, journal: PulsusInputStr) -> str:
         """Generate title via Gemini."""
         prompt = f"""
         Generate a 5-7 word title based on this summary: {summary}
         
         IMPORTANT: Respond with ONLY the title. The title should be in title case, all articles and joining words should be in lower case (Example: The Financial Literacy: Crucial for Outcomes and Resilience). No additional text, explanations, or formatting.
         """
-        response = PipelineService._ask_gemini_with_retries(prompt)
+        response = await PipelineService._ask_gemini_with_retries(prompt)
 
         if journal.brandName == "alliedAcademy.tex":
             storeTempTitle = response.split(": ")
@@ -417,7 +718,95 @@ class PipelineService:
         return output
 
     @staticmethod
-    def _generate_html_and_pdf(journal, output_data):
+    def _render_html(journal, output_data) -> str:
+        """Render `Format.html` for one journal record."""
+        html_template = TemplateService.html_template("Format.html")
+        forHtml = copy.deepcopy(output_data[journal.id])
+
+        # Link citation markers to the reference list
+        citations = CitationService.html_table(forHtml["content"], journal.brandName)
+        sections = (
+            ("introduction", "description", "discussion")
+            if journal.brandName == "Irjesti.tex"
+            else ("introduction", "description", "discussion", "abstract", "conclusion")
+        )
+        CitationService.link_sections(forHtml, sections, citations, suffix="</p><p>")
+
+        forHtml["description"] = forHtml["description"].replace(r"\n\n", "</p><p>")
+        forHtml["description"] = forHtml["description"].replace(r"\n", "</p><p>")
+
+        storeBody = {}
+
+        if journal.brandName == "alliedAcademy.tex":
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+        elif journal.brandName == "omics.tex":
+            storeBody["Abstract"] = forHtml["abstract"]
+            storeBody["Keywords"] = forHtml["keywords"]
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Description"] = forHtml["description"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+        elif journal.brandName == "hilaris.tex":
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Description"] = forHtml["description"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+            storeBody["Acknowledgement"] = None
+            storeBody["Conflict_of_Interest"] = None
+        elif journal.brandName == "iomc.tex":
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Description"] = forHtml["description"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+        elif journal.brandName == "Irjesti.tex":
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Description"] = forHtml["description"]
+            storeBody["Discussion"] = forHtml["discussion"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+        else:
+            storeBody["Introduction"] = forHtml["introduction"]
+            storeBody["Description"] = forHtml["description"]
+            storeBody["Conclusion"] = forHtml["conclusion"]
+
+        forHtml["storeBody"] = storeBody
+
+        count = 0
+        forHtml["storeRefPart"] = ""
+        for i in forHtml["content"].values():
+            count += 1
+            i["issues"] = f"({i['issues']})" if i.get("issues") else ""
+
+            if journal.brandName == "alliedAcademy.tex":
+                temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]}. <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>. {i["journalShortName"]}. {i["published"]};{i["volume"]}{i["issues"]}:{i["pageRangeOrNumber"]}.
+                <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
+            elif journal.brandName == "omics.tex":
+                temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]} ({i["published"]}) <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>.{i["journalShortName"]} {i["volume"]}:{i["pageRangeOrNumber"]}.
+                <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
+            elif journal.brandName == "hilaris.tex":
+                temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_full"]}. <a href="{i["parentLink"]}" target="_blank">"{i["title"]}"</a>.<i>{i["journalShortName"]}</i> {i["volume"]} ({i["published"]}):{i["pageRangeOrNumber"]}.
+                <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
+            elif journal.brandName == "iomc.tex":
+                temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]} <a href="{i["url"]}" target="_blank">"{i["title"]}"</a>.<i>{i["journalShortName"]}</i> ({i["published"]});{i["volume"]}:{i["pageRangeOrNumber"]}.
+                <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
+            else:
+                temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]}. <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>. {i["journalShortName"]}. {i["published"]};{i["volume"]}{i["issues"]}:{i["pageRangeOrNumber"]}.
+                <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
+
+            forHtml["storeRefPart"] = f"""{forHtml['storeRefPart']}\n{temp}"""
+
+        department_parts = forHtml["authorsDepartment"].split(",")
+        if len(department_parts) > 1:
+            forHtml["prefixAuthorDepartment"] = f"{department_parts[0]}<br />"
+            forHtml["suffixAuthorDepartment"] = (
+                f"{','.join(department_parts[1:])}.<br />"
+            )
+        else:
+            forHtml["prefixAuthorDepartment"] = forHtml["authorsDepartment"]
+            forHtml["suffixAuthorDepartment"] = "<br />"
+
+        rendered_html = html_template.render(**forHtml)
+        return rendered_html
+
+    @staticmethod
+    async def _generate_html_and_pdf(journal, output_data, progress=None):
         """Move all your LaTeX + HTML rendering logic here."""
         # --- Centralized Directory Setup ---
         
@@ -431,172 +820,31 @@ class PipelineService:
         log_folder = output_log_dir / journal.id
         log_folder.mkdir(parents=True, exist_ok=True)
 
-        print("Step 8.1 : Final response ✔")
+        PipelineService._report(progress, "8.1", "Final response")
 
         # --- 9: Create HTML file ---
-        env_html = Environment(
-            loader=FileSystemLoader(pathOfPathLib("Apps/templates/"))
-        )
+        # Save the HTML file inside the journal's dedicated folder; identical
+        # journal data + template + render version is served from the artifact cache.
+        html_file_path = journal_folder / f"{journal.id}.html"
         try:
-            html_template = env_html.get_template("Format.html")
-            forHtml = copy.deepcopy(output_data[journal.id])
-
-            # Logic for processing references for HTML
-            if journal.brandName == "Irjesti.tex":
-                start = 0
-                for i in forHtml["content"].keys():
-                    start += 1
-                    storeChangedName = f"[{forHtml['content'][i]['authors_short'].split(', ')[0]} et al., {forHtml['content'][i]['published']}]"
-                    forHtml["introduction"] = forHtml["introduction"].replace(
-                        f"[{start}].",
-                        f"[<a href='#{start}' title='{start}'>{storeChangedName}</a>].</p><p>",
-                    )
-                    forHtml["description"] = forHtml["description"].replace(
-                        f"[{start}].",
-                        f"[<a href='#{start}' title='{start}'>{storeChangedName}</a>].</p><p>",
-                    )
-                    forHtml["discussion"] = forHtml["discussion"].replace(
-                        f"[{start}].",
-                        f"[<a href='#{start}' title='{start}'>{storeChangedName}</a>].</p><p>",
-                    )
-            else:
-                for i in range(1, len(forHtml["content"]) + 1):
-                    forHtml["introduction"] = forHtml["introduction"].replace(
-                        f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-                    )
-                    forHtml["description"] = forHtml["description"].replace(
-                        f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-                    )
-                    forHtml["discussion"] = forHtml["discussion"].replace(
-                        f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-                    )
-                    forHtml["abstract"] = forHtml["abstract"].replace(
-                        f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-                    )
-                    forHtml["conclusion"] = forHtml["conclusion"].replace(
-                        f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-                    )
-
-            forHtml["description"] = forHtml["description"].replace(r"\n\n", "</p><p>")
-            forHtml["description"] = forHtml["description"].replace(r"\n", "</p><p>")
-
-            storeBody = {}
-
-            if journal.brandName == "alliedAcademy.tex":
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-            elif journal.brandName == "omics.tex":
-                storeBody["Abstract"] = forHtml["abstract"]
-                storeBody["Keywords"] = forHtml["keywords"]
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Description"] = forHtml["description"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-            elif journal.brandName == "hilaris.tex":
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Description"] = forHtml["description"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-                storeBody["Acknowledgement"] = None
-                storeBody["Conflict_of_Interest"] = None
-            elif journal.brandName == "iomc.tex":
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Description"] = forHtml["description"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-            elif journal.brandName == "Irjesti.tex":
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Description"] = forHtml["description"]
-                storeBody["Discussion"] = forHtml["discussion"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-            else:
-                storeBody["Introduction"] = forHtml["introduction"]
-                storeBody["Description"] = forHtml["description"]
-                storeBody["Conclusion"] = forHtml["conclusion"]
-
-            forHtml["storeBody"] = storeBody
-
-            count = 0
-            forHtml["storeRefPart"] = ""
-            for i in forHtml["content"].values():
-                count += 1
-                i["issues"] = f"({i['issues']})" if i.get("issues") else ""
-
-                if journal.brandName == "alliedAcademy.tex":
-                    temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]}. <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>. {i["journalShortName"]}. {i["published"]};{i["volume"]}{i["issues"]}:{i["pageRangeOrNumber"]}.
-                    <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
-                elif journal.brandName == "omics.tex":
-                    temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]} ({i["published"]}) <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>.{i["journalShortName"]} {i["volume"]}:{i["pageRangeOrNumber"]}.
-                    <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
-                elif journal.brandName == "hilaris.tex":
-                    temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_full"]}. <a href="{i["parentLink"]}" target="_blank">"{i["title"]}"</a>.<i>{i["journalShortName"]}</i> {i["volume"]} ({i["published"]}):{i["pageRangeOrNumber"]}.
-                    <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
-                elif journal.brandName == "iomc.tex":
-                    temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]} <a href="{i["url"]}" target="_blank">"{i["title"]}"</a>.<i>{i["journalShortName"]}</i> ({i["published"]});{i["volume"]}:{i["pageRangeOrNumber"]}.
-                    <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
-                else:
-                    temp = f"""<li><a name="{count}" id="{count}"></a>{i["authors_short"]}. <a href="{i["parentLink"]}" target="_blank">{i["title"]}</a>. {i["journalShortName"]}. {i["published"]};{i["volume"]}{i["issues"]}:{i["pageRangeOrNumber"]}.
-                    <p align="right"><a href="{i["url"]}" target="_blank"><u>Indexed at</u></a>, <a href="https://scholar.google.com/scholar?hl=en&as_sdt=0%2C5&q={'+'.join(i["title"].split(' '))}&btnG=" target="_blank"><u>Google Scholar</u></a>, <a href="https://doi.org/{i["DOI"]}" target="_blank"><u>Crossref</u></a></p></li>"""
-
-                forHtml["storeRefPart"] = f"""{forHtml['storeRefPart']}\n{temp}"""
-
-            department_parts = forHtml["authorsDepartment"].split(",")
-            if len(department_parts) > 1:
-                forHtml["prefixAuthorDepartment"] = f"{department_parts[0]}<br />"
-                forHtml["suffixAuthorDepartment"] = (
-                    f"{','.join(department_parts[1:])}.<br />"
-                )
-            else:
-                forHtml["prefixAuthorDepartment"] = forHtml["authorsDepartment"]
-                forHtml["suffixAuthorDepartment"] = "<br />"
-
-            rendered_html = html_template.render(**forHtml)
-
-            # Save the HTML file inside the journal's dedicated folder
-            html_file_path = journal_folder / f"{journal.id}.html"
-            html_file_path.write_text(rendered_html, encoding="utf-8")
-
+            html_key = ArtifactCache.text_key(
+                PipelineService.HTML_RENDER_VERSION,
+                json.dumps(output_data[journal.id], sort_keys=True, default=str),
+                (TemplateService.TEMPLATE_DIR / "Format.html").read_text(encoding="utf-8"),
+            )
+            if not ArtifactCache.fetch(html_key, ".html", html_file_path):
+                rendered_html = PipelineService._render_html(journal, output_data)
+                html_file_path.write_text(rendered_html, encoding="utf-8")
+                ArtifactCache.store(html_key, ".html", html_file_path)
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to generate HTML file: {str(e)}"
             )
 
-        print("Step 9 : Created HTML file ✔")
+        PipelineService._report(progress, "9", "Created HTML file")
 
         # --- 10: Create PDF file ---
-        env_latex = Environment(
-            block_start_string=r"\BLOCK{",
-            block_end_string="}",
-            variable_start_string=r"\VAR{",
-            variable_end_string="}",
-            comment_start_string=r"\#{",
-            comment_end_string="}",
-            line_statement_prefix="%%",
-            line_comment_prefix="%#",
-            trim_blocks=True,
-            autoescape=False,
-            loader=FileSystemLoader(pathOfPathLib("Apps/templates")),
-        )
-
-        def latex_escape(text):
-            if not isinstance(text, str):
-                return text
-            replacements = {
-                "&": r"\&",
-                "%": r"\%",
-                "$": r"\$",
-                "#": r"\#",
-                "_": r"\_",
-                "{": r"\{",
-                "}": r"\}",
-                "^": r"\^{}",
-                "~": r"\textasciitilde{}",
-                "\\": r"\textbackslash{}",
-                "rizzBro": r"\textbf{",
-                "hoez": r"}",
-            }
-            pattern = re.compile("|".join(re.escape(k) for k in replacements.keys()))
-            return pattern.sub(lambda m: replacements[m.group()], text)
-
-        env_latex.filters["latex_escape"] = latex_escape
-        template = env_latex.get_template(journal.brandName)
+        template = TemplateService.latex_template(journal.brandName)
 
         brand_key = journal.brandName.replace(".tex", "")
         lang_map = LatexLanguageConfig().get_lang_map(brand_key)
@@ -620,21 +868,11 @@ class PipelineService:
         forPdf = copy.deepcopy(output_data[journal.id])
 
         if journal.brandName == "Irjesti.tex":
-            start = 0
-            for i in forPdf["content"].keys():
-                start += 1
-                storeChangedName = f"({forPdf['content'][i]['authors_short'].split(', ')[0]} et al., {forPdf['content'][i]['published']})."
-                storeChangedName = "rizzBro" + storeChangedName + "hoez"
-
-                forPdf["introduction"] = forPdf["introduction"].replace(
-                    f"[{start}].", storeChangedName
-                )
-                forPdf["description"] = forPdf["description"].replace(
-                    f"[{start}].", storeChangedName
-                )
-                forPdf["discussion"] = forPdf["discussion"].replace(
-                    f"[{start}].", storeChangedName
-                )
+            CitationService.link_sections(
+                forPdf,
+                ("introduction", "description", "discussion"),
+                CitationService.latex_table(forPdf["content"]),
+            )
 
         rendered_latex = template.render(**forPdf)
 
@@ -642,46 +880,31 @@ class PipelineService:
         tex_file_path = journal_folder / f"{journal.id}.tex"
         tex_file_path.write_text(rendered_latex, encoding="utf-8")
 
-        # Compile LaTeX to PDF. Run from within the journal's folder.
-        for i in range(2):
-            result = subprocess.run(
-                [
-                    "xelatex",
-                    "-interaction=nonstopmode",
-                    tex_file_path.name,
-                ],
-                capture_output=True,  # Capture stdout/stderr
-                text=True,
-                cwd=journal_folder,  # CRITICAL: Set the working directory
+        # Seed the .aux/.out of the previous build so an unchanged document settles in one pass
+        for ext in [".aux", ".out"]:
+            previous = log_folder / f"{journal.id}{ext}"
+            if previous.exists():
+                shutil.copyfile(previous, journal_folder / f"{journal.id}{ext}")
+
+        # Compile LaTeX to PDF on the shared compile pool (runs inside the journal's folder).
+        result = await CompileService.compile(tex_file_path, format_name=brand_key)
+        if not result["ok"]:
+            # No pass number when xelatex never ran (e.g. it could not be started)
+            where = f" on run {result['passes']}" if result["passes"] else ""
+            raise HTTPException(
+                status_code=500,
+                detail=f"LaTeX compilation failed{where}:\n\n{result['error']}",
             )
 
-            if result.returncode != 0:
-                log_file_path = log_folder / f"{journal.id}.log"
-                log_file_path = log_file_path.with_suffix(".log")
-
-                # The log file is already saved by xelatex, so we just read it for the error message
-                error_text = "Unknown LaTeX error. Check the log file."
-                if log_file_path.exists():
-                    with open(log_file_path, "r") as f:
-                        lines = f.readlines()
-                    error_snippets = [line for line in lines if line.startswith("! ")]
-                    error_text = (
-                        "\n".join(error_snippets)
-                        or f"LaTeX compilation failed. Full log in {log_file_path}"
-                    )
-
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"LaTeX compilation failed on run {i + 1}:\n\n{error_text}",
-                )
-
         for ext in [".log", ".aux", ".out"]:
             src = journal_folder / f"{journal.id}{ext}"
             dst = log_folder / f"{journal.id}{ext}"
             if src.exists():
                 src.replace(dst)  # move file
 
-        print("Step 10 : Create PDF file ✔")
+        PipelineService._report(
+            progress, "10", f"Create PDF file ({result['passes']} xelatex passes)"
+        )
 
         return JSONResponse(
             status_code=200,
@@ -0,0 +1,113 @@
+# File: Apps/services/rate_limiter.py
+from Apps.config import Config
+from Apps.library_import import asyncio, threading, time, Dict, Any
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` tokens per second,
+    holding at most one minute's worth.
+
+    `reserve` takes the tokens immediately, letting the balance go negative,
+    and returns how long the caller must wait for its turn. Callers are
+    therefore served in arrival order, and async and thread callers share
+    one budget.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single call larger than the whole bucket waits for a full bucket
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Client-side requests/min and tokens/min limiter for one LLM provider.
+
+    Every call reserves one request plus an estimated token count (prompt
+    length / `CHARS_PER_TOKEN`) before it is sent. Batch runs therefore hit
+    the provider quota smoothly instead of bursting into 429s. A limit of 0
+    disables that bucket. One limiter per provider, shared via
+    `RateLimiter.get(name)`.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    _registry: Dict[str, "RateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "throttled": 0, "waited_seconds": 0.0, "tokens": 0}
+
+    @staticmethod
+    def get(name: str) -> "RateLimiter":
+        """The shared limiter for `name` ("gemini", "groq")."""
+        limiter = RateLimiter._registry.get(name)
+        if limiter is None:
+            with RateLimiter._registry_lock:
+                limiter = RateLimiter._registry.get(name)
+                if limiter is None:
+                    rpm, tpm = Config.UPSTREAM_QUOTAS.get(name, (0, 0))
+                    limiter = RateLimiter._registry[name] = RateLimiter(name, rpm, tpm)
+        return limiter
+
+    @staticmethod
+    def all_metrics() -> Dict[str, Any]:
+        return {name: limiter.metrics() for name, limiter in RateLimiter._registry.items()}
+
+    @staticmethod
+    def estimate_tokens(prompt) -> int:
+        return len(str(prompt)) // RateLimiter.CHARS_PER_TOKEN + 1
+
+    # ==========================
+    # ⏳ Acquire
+    # ==========================
+    async def acquire(self, prompt) -> None:
+        """Wait (without blocking the loop) until `prompt` fits the quotas."""
+        delay = self._reserve(prompt)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, prompt) -> None:
+        """Blocking variant for thread callers."""
+        delay = self._reserve(prompt)
+        if delay > 0:
+            time.sleep(delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "waited_seconds": round(self._stats["waited_seconds"], 2),
+                "requests_per_minute": self.requests.capacity if self.requests else None,
+                "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+            }
+
+    def _reserve(self, prompt) -> float:
+        estimate = RateLimiter.estimate_tokens(prompt)
+        with self._lock:
+            delay = max(
+                self.requests.reserve(1) if self.requests else 0.0,
+                self.tokens.reserve(estimate) if self.tokens else 0.0,
+            )
+            self._stats["calls"] += 1
+            self._stats["tokens"] += estimate
+            if delay > 0:
+                self._stats["throttled"] += 1
+                self._stats["waited_seconds"] += delay
+        if delay > 1:
+            print(f"[INFO] {self.name} rate limit: waiting {delay:.1f}s")
+        return delay
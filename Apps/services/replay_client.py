@@ -0,0 +1,149 @@
+# File: Apps/services/replay_client.py
+from Apps.library_import import asyncio, hashlib, json, threading, Dict, Any, Optional
+from Apps.library_import import pathOfPathLib
+
+
+class MissingRecordingError(LookupError):
+    """Raised in replay mode for a prompt that was never recorded."""
+
+    retryable = False  # replaying again cannot help; RetryPolicy must not spin on it
+
+
+class ReplayResponse:
+    """The part of a genai response the app reads."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ReplayGeminiClient:
+    """
+    Offline stand-in for `genai.Client`, selected with GEMINI_REPLAY.
+
+    - Replay mode (no `client`): `generate_content` answers from a JSONL file of
+      recorded responses, keyed by model, prompt and config (response schemas
+      included). A prompt that was never recorded raises `MissingRecordingError`.
+    - Record mode (a real `client`): calls go to Gemini and every answer is
+      appended to the file.
+
+    Provides what the services call: `models.generate_content`,
+    `aio.models.generate_content` and `aio.models.generate_content_stream`
+    (a recorded answer is replayed as one chunk).
+    """
+
+    def __init__(self, path: pathOfPathLib, client=None):
+        self.path = pathOfPathLib(path)
+        self.client = client
+        self.stats = {"calls": 0, "replayed": 0, "recorded": 0, "missing": 0}
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recordings[entry["key"]] = entry["text"]
+        self.models = _ReplayModels(self)
+        self.aio = _ReplayAio(self)
+        mode = "recording to" if client is not None else "replaying from"
+        print(f"[INFO] Gemini {mode} {self.path} ({len(self._recordings)} recorded responses)")
+
+    @staticmethod
+    def key(model: str, contents, config=None) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [model, contents, ReplayGeminiClient._plain(config)],
+                sort_keys=True,
+                ensure_ascii=False,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def lookup(self, model: str, contents, config=None) -> ReplayResponse:
+        key = ReplayGeminiClient.key(model, contents, config)
+        with self._lock:
+            self.stats["calls"] += 1
+            text = self._recordings.get(key)
+            if text is None:
+                self.stats["missing"] += 1
+                raise MissingRecordingError(
+                    f"No recorded Gemini response for this {model} prompt (key {key[:12]}); "
+                    "record it first with GEMINI_REPLAY=record"
+                )
+            self.stats["replayed"] += 1
+        return ReplayResponse(text)
+
+    def record(self, model: str, contents, config, text: str) -> None:
+        key = ReplayGeminiClient.key(model, contents, config)
+        entry = {"key": key, "model": model, "prompt": str(contents)[:200], "text": text}
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["recorded"] += 1
+            self._recordings[key] = text
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @staticmethod
+    def _plain(config) -> Any:
+        """JSON-friendly config: Pydantic response schemas become their JSON schema."""
+        if isinstance(config, dict):
+            return {k: ReplayGeminiClient._plain(v) for k, v in config.items()}
+        if isinstance(config, type) and hasattr(config, "model_json_schema"):
+            return config.model_json_schema()
+        return config
+
+
+class _ReplayModels:
+    def __init__(self, replay: ReplayGeminiClient):
+        self.replay = replay
+
+    def generate_content(self, *, model: str, contents, config=None):
+        if self.replay.client is None:
+            return self.replay.lookup(model, contents, config)
+        response = self.replay.client.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+        self.replay.record(model, contents, config, response.text)
+        return response
+
+
+class _AsyncReplayModels:
+    def __init__(self, replay: ReplayGeminiClient):
+        self.replay = replay
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        if self.replay.client is None:
+            return self.replay.lookup(model, contents, config)
+        response = await self.replay.client.aio.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+        await asyncio.to_thread(self.replay.record, model, contents, config, response.text)
+        return response
+
+    async def generate_content_stream(self, *, model: str, contents, config=None):
+        if self.replay.client is None:
+            response = self.replay.lookup(model, contents, config)
+
+            async def replayed():
+                yield response
+
+            return replayed()
+
+        stream = await self.replay.client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config
+        )
+
+        async def recorded():
+            parts = []
+            async for chunk in stream:
+                parts.append(chunk.text or "")
+                yield chunk
+            await asyncio.to_thread(self.replay.record, model, contents, config, "".join(parts))
+
+        return recorded()
+
+
+class _ReplayAio:
+    def __init__(self, replay: ReplayGeminiClient):
+        self.models = _AsyncReplayModels(replay)
@@ -0,0 +1,243 @@
+# File: Apps/services/response_cache.py
+from Apps.library_import import asyncio, copy, hashlib, json, sqlite3, threading, time
+from Apps.library_import import OrderedDict, Future, Dict, Any, Optional
+from Apps.library_import import pathOfPathLib
+
+
+class ResponseCache:
+    """
+    In-process LRU + TTL cache for upstream responses, with single-flight.
+
+    - At most `max_entries` responses are kept in memory; the least recently
+      used is dropped first, and entries older than `ttl` seconds are misses.
+    - Concurrent `get_or_fetch` calls for the same key share one upstream
+      call, run as its own task that every caller awaits; cancelling one
+      caller does not cancel the fetch for the others. Failures are not
+      cached, so every waiter sees the error and the next call retries.
+    - With a `db_path`, responses are also written to a SQLite table and
+      survive restarts (values must then be JSON-serializable).
+
+    Callers get a deep copy, so mutating a response never alters the cache.
+    One cache per use, shared via `ResponseCache.get(name, ...)`.
+    """
+
+    DB_FILE = pathOfPathLib(__file__).resolve().parent.parent / "DB" / "responseCache.sqlite3"
+
+    _registry: Dict[str, "ResponseCache"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        db_path: Optional[pathOfPathLib] = None,
+    ):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.db_path = pathOfPathLib(db_path) if db_path else None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._inflight_sync: Dict[str, Future] = {}
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS response_cache ("
+                        "namespace TEXT NOT NULL, "
+                        "key TEXT NOT NULL, "
+                        "value TEXT NOT NULL, "
+                        "expires_at REAL NOT NULL, "
+                        "PRIMARY KEY (namespace, key))"
+                    )
+            finally:
+                conn.close()
+
+    @staticmethod
+    def get(name: str, max_entries: int, ttl: float, db_path=None) -> "ResponseCache":
+        """The shared cache called `name` (created with these settings on first use)."""
+        cache = ResponseCache._registry.get(name)
+        if cache is None:
+            with ResponseCache._registry_lock:
+                cache = ResponseCache._registry.get(name)
+                if cache is None:
+                    cache = ResponseCache._registry[name] = ResponseCache(
+                        name, max_entries, ttl, db_path
+                    )
+        return cache
+
+    @staticmethod
+    def all_metrics() -> Dict[str, Any]:
+        return {name: cache.metrics() for name, cache in ResponseCache._registry.items()}
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Stable key for JSON-serializable request parts."""
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ==========================
+    # 🔍 Lookups
+    # ==========================
+    async def get_or_fetch(self, key: str, fetch, refresh: bool = False):
+        """
+        Cached value for `key`, or the result of awaiting `fetch()` (coalesced).
+        `refresh=True` skips the lookup and replaces the entry with a fresh value.
+        """
+        if self.max_entries == 0:
+            return await fetch()
+        found, value = (False, None) if refresh else self._lookup_memory(key)
+        if not found and self.db_path and not refresh:
+            found, value = await asyncio.to_thread(self._lookup_disk, key)
+        if found:
+            return copy.deepcopy(value)
+
+        task = None if refresh else self._inflight.get(key)
+        if task is not None:
+            with self._lock:
+                self._stats["coalesced"] += 1
+        else:
+            # The fetch runs in its own task: a caller that is cancelled (client
+            # disconnected) stops waiting, but the callers sharing it still get the result
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight.setdefault(key, task)
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def get_or_fetch_sync(self, key: str, fetch, refresh: bool = False):
+        """Blocking variant for thread callers (sync routes)."""
+        if self.max_entries == 0:
+            return fetch()
+        found, value = (False, None) if refresh else self._lookup_memory(key)
+        if not found and self.db_path and not refresh:
+            found, value = self._lookup_disk(key)
+        if found:
+            return copy.deepcopy(value)
+
+        with self._lock:
+            waiter = None if refresh else self._inflight_sync.get(key)
+            if waiter is not None:
+                self._stats["coalesced"] += 1
+            else:
+                future = Future()
+                self._inflight_sync.setdefault(key, future)
+        if waiter is not None:
+            return copy.deepcopy(waiter.result())
+
+        try:
+            value = fetch()
+            if self.db_path:
+                self._store_disk(key, value)
+            self._store_memory(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                if self._inflight_sync.get(key) is future:
+                    del self._inflight_sync[key]
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM response_cache WHERE namespace = ?", (self.name,))
+            finally:
+                conn.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "persistent": self.db_path is not None,
+            }
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    async def _fetch_and_store(self, key: str, fetch):
+        value = await fetch()
+        if self.db_path:
+            await asyncio.to_thread(self._store_disk, key, value)
+        self._store_memory(key, value)
+        return value
+
+    def _fetch_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller has gone away
+
+    def _lookup_memory(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            if not self.db_path:
+                self._stats["misses"] += 1
+        return False, None
+
+    def _store_memory(self, key: str, value, expires_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at or time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _lookup_disk(self, key: str):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM response_cache "
+                "WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.name, key, time.time()),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return False, None
+        value = json.loads(row[0])
+        self._store_memory(key, value, row[1])
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        return True, value
+
+    def _store_disk(self, key: str, value) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (namespace, key, value, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.name, key, json.dumps(value, ensure_ascii=False), now + self.ttl),
+                )
+                conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        finally:
+            conn.close()
@@ -0,0 +1,118 @@
+# File: Apps/services/retry_policy.py
+from Apps.library_import import asyncio, httpx, random, time, Optional
+
+
+class RetryPolicy:
+    """
+    Retries for outbound calls (Gemini, Groq, CORE, Google Translate).
+
+    Waits grow exponentially (`base_delay * multiplier ** attempt`, capped at
+    `max_delay`) with full jitter, so callers that failed together do not
+    retry together. `deadline` bounds the whole call including waits; async
+    attempts are also cut off when it expires. Only transient errors are
+    retried by default: HTTP 408/425/429/5xx and errors without a status
+    (network failures), but not bad requests or local data/programming errors.
+    """
+
+    TRANSIENT_STATUS = {408, 425, 429}
+    PERMANENT_ERRORS = (ValueError, TypeError, KeyError, AttributeError)
+
+    def __init__(
+        self,
+        name: str,
+        attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        deadline: Optional[float] = None,
+        retry_on=None,
+    ):
+        """
+        :param name: Label used in the retry log lines.
+        :param attempts: Maximum number of calls (first call included).
+        :param deadline: Overall time budget in seconds, or None for no limit.
+        :param retry_on: Optional `exc -> bool` replacing `is_transient`.
+        """
+        self.name = name
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.deadline = deadline
+        self.retry_on = retry_on or RetryPolicy.is_transient
+
+    # ==========================
+    # 🔁 Running calls
+    # ==========================
+    async def run(self, func, *args, **kwargs):
+        """Await `func(*args, **kwargs)` until it succeeds or the policy gives up."""
+        end = time.monotonic() + self.deadline if self.deadline else None
+        for attempt in range(self.attempts):
+            try:
+                if end is None:
+                    return await func(*args, **kwargs)
+                return await asyncio.wait_for(func(*args, **kwargs), end - time.monotonic())
+            except Exception as e:
+                delay = self._next_delay(attempt, e, end)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    def run_sync(self, func, *args, **kwargs):
+        """Blocking variant for sync call sites (worker threads, sync routes)."""
+        end = time.monotonic() + self.deadline if self.deadline else None
+        for attempt in range(self.attempts):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(attempt, e, end)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter wait before retry number `attempt + 1`."""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return random.uniform(0, cap)
+
+    # ==========================
+    # 🧭 Error classification
+    # ==========================
+    @staticmethod
+    def status_code(exc: BaseException) -> Optional[int]:
+        """HTTP status of an SDK/HTTP error, if it carries one."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code
+        for attr in ("status_code", "code"):  # Groq/FastAPI, google-genai
+            value = getattr(exc, attr, None)
+            if isinstance(value, int):
+                return value
+        return None
+
+    @staticmethod
+    def is_transient(exc: BaseException) -> bool:
+        if getattr(exc, "retryable", None) is False:  # e.g. CircuitOpenError
+            return False
+        status = RetryPolicy.status_code(exc)
+        if status is not None:
+            return status in RetryPolicy.TRANSIENT_STATUS or status >= 500
+        return not isinstance(exc, RetryPolicy.PERMANENT_ERRORS)
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    def _next_delay(self, attempt: int, exc: BaseException, end: Optional[float]) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if isinstance(exc, asyncio.TimeoutError) and end is not None and time.monotonic() >= end:
+            return None  # the overall deadline cut the attempt off
+        if attempt + 1 >= self.attempts or not self.retry_on(exc):
+            return None
+        delay = self.backoff(attempt)
+        if end is not None and time.monotonic() + delay >= end:
+            return None
+        print(
+            f"[WARN] {self.name} attempt {attempt + 1}/{self.attempts} failed: "
+            f"{type(exc).__name__}: {exc}. "
+            f"Retrying in {delay:.1f}s"
+        )
+        return delay
@@ -0,0 +1,54 @@
+# File: Apps/services/stage_graph.py
+from Apps.library_import import asyncio, Dict, Any
+
+
+class StageGraph:
+    """
+    Runs async pipeline stages as a dependency graph.
+
+    Each stage is an async callable that receives the results of the stages it
+    depends on as keyword arguments. It starts as soon as those stages have
+    finished, so independent stages run concurrently and a dependent stage
+    waits only on its own inputs. If any stage fails, the ones still running
+    are cancelled and the error is raised from `run`.
+
+    Example:
+        graph = StageGraph()
+        graph.add("references", fetch_references)
+        graph.add("summary", write_summary, "references")
+        graph.add("title", write_title, "summary")
+        results = await graph.run()  # {"references": ..., "summary": ..., "title": ...}
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, tuple] = {}
+
+    def add(self, name: str, func, *depends_on: str) -> "StageGraph":
+        """Register `func(**{dep: result})`; dependencies must be added first (no cycles)."""
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        missing = [dep for dep in depends_on if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(missing)}")
+        self._stages[name] = (func, depends_on)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage and return their results by name."""
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(name: str):
+            func, depends_on = self._stages[name]
+            inputs = {dep: await tasks[dep] for dep in depends_on}
+            return await func(**inputs)
+
+        for name in self._stages:
+            tasks[name] = asyncio.create_task(run_stage(name), name=f"stage:{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return {name: task.result() for name, task in tasks.items()}
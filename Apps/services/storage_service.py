@@ -0,0 +1,227 @@
+# File: Apps/services/storage_service.py
+from Apps.library_import import json, os, sqlite3, threading, time, Dict, Any, Optional, List
+from Apps.library_import import pathOfPathLib, ABC, abstractmethod
+
+
+class JournalStore(ABC):
+    """
+    Base class for journal record storage.
+
+    A store holds one table of journal records keyed by journal ID
+    (e.g. "J001") and supports point reads, point upserts and deletes.
+    """
+
+    @abstractmethod
+    def fetch_all(self) -> Dict[str, Any]:
+        """Every record, by journal ID."""
+
+    @abstractmethod
+    def fetch(self, journal_id: str) -> Optional[Dict[str, Any]]:
+        """One record, or None if the ID is unknown."""
+
+    def exists(self, journal_id: str) -> bool:
+        return self.fetch(journal_id) is not None
+
+    def list_ids(self) -> List[str]:
+        return list(self.fetch_all().keys())
+
+    @abstractmethod
+    def upsert(self, journal_id: str, record: Dict[str, Any]) -> None:
+        """Insert or replace one record."""
+
+    @abstractmethod
+    def delete(self, journal_id: str) -> bool:
+        """Remove one record; False if it did not exist."""
+
+    @abstractmethod
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        """Replace the whole table with `data`."""
+
+
+class JsonJournalStore(JournalStore):
+    """
+    Legacy whole-file JSON store (`journalDBInput.json` / `journalDBOutput.json`).
+    Every operation reads and rewrites the entire file.
+    """
+
+    def __init__(self, path: pathOfPathLib):
+        self.path = pathOfPathLib(path)
+        self._lock = threading.Lock()
+
+    def fetch_all(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+                return data if isinstance(data, dict) else {}
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def fetch(self, journal_id: str) -> Optional[Dict[str, Any]]:
+        return self.fetch_all().get(journal_id)
+
+    def upsert(self, journal_id: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            data = self.fetch_all()
+            data[journal_id] = record
+            self._write(data)
+
+    def delete(self, journal_id: str) -> bool:
+        with self._lock:
+            data = self.fetch_all()
+            if journal_id not in data:
+                return False
+            del data[journal_id]
+            self._write(data)
+            return True
+
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(data or {})
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False, default=str)
+
+
+class SqliteJournalStore(JournalStore):
+    """
+    SQLite-backed store with one row per journal and the journal ID as primary key.
+    Reads, upserts and deletes touch only the affected row.
+    """
+
+    def __init__(self, db_path: pathOfPathLib, table: str):
+        self.db_path = pathOfPathLib(db_path)
+        self.table = table
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                    "id TEXT PRIMARY KEY, "
+                    "data TEXT NOT NULL, "
+                    "updated_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self, query: str, params: tuple = (), fetch: str = None):
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(query, params)
+                if fetch == "one":
+                    return cursor.fetchone()
+                if fetch == "all":
+                    return cursor.fetchall()
+                return cursor.rowcount
+        finally:
+            conn.close()
+
+    def fetch_all(self) -> Dict[str, Any]:
+        rows = self._run(f"SELECT id, data FROM {self.table} ORDER BY id", fetch="all")
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def fetch(self, journal_id: str) -> Optional[Dict[str, Any]]:
+        row = self._run(
+            f"SELECT data FROM {self.table} WHERE id = ?", (journal_id,), fetch="one"
+        )
+        return json.loads(row[0]) if row else None
+
+    def exists(self, journal_id: str) -> bool:
+        row = self._run(
+            f"SELECT 1 FROM {self.table} WHERE id = ?", (journal_id,), fetch="one"
+        )
+        return row is not None
+
+    def list_ids(self) -> List[str]:
+        rows = self._run(f"SELECT id FROM {self.table} ORDER BY id", fetch="all")
+        return [row[0] for row in rows]
+
+    def upsert(self, journal_id: str, record: Dict[str, Any]) -> None:
+        self._run(
+            f"INSERT INTO {self.table} (id, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            (journal_id, self._dumps(record), time.time()),
+        )
+
+    def delete(self, journal_id: str) -> bool:
+        return self._run(f"DELETE FROM {self.table} WHERE id = ?", (journal_id,)) > 0
+
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"DELETE FROM {self.table}")
+                conn.executemany(
+                    f"INSERT INTO {self.table} (id, data, updated_at) VALUES (?, ?, ?)",
+                    [
+                        (journal_id, self._dumps(record), time.time())
+                        for journal_id, record in (data or {}).items()
+                    ],
+                )
+        finally:
+            conn.close()
+
+    # ==========================
+    # 🚚 JSON Migration
+    # ==========================
+    def migrate_from_json(self, json_path: pathOfPathLib) -> int:
+        """
+        One-shot import of a legacy JSON file into this table.
+        Runs only once per table (tracked in `store_meta`); existing rows win.
+        Returns the number of imported records.
+        """
+        marker = f"migrated:{self.table}"
+        if self._run(
+            "SELECT 1 FROM store_meta WHERE key = ?", (marker,), fetch="one"
+        ):
+            return 0
+
+        legacy = JsonJournalStore(json_path).fetch_all()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {self.table} (id, data, updated_at) VALUES (?, ?, ?)",
+                    [
+                        (journal_id, self._dumps(record), time.time())
+                        for journal_id, record in legacy.items()
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                    (marker, str(pathOfPathLib(json_path))),
+                )
+        finally:
+            conn.close()
+        return len(legacy)
+
+    @staticmethod
+    def _dumps(record: Dict[str, Any]) -> str:
+        return json.dumps(record, ensure_ascii=False, default=str)
+
+
+def build_store(backend: str, json_path: pathOfPathLib, db_path: pathOfPathLib, table: str) -> JournalStore:
+    """Create the configured store; SQLite stores pull in the legacy JSON file once."""
+    if backend == "json":
+        return JsonJournalStore(json_path)
+    if backend == "sqlite":
+        store = SqliteJournalStore(db_path, table)
+        if os.path.exists(json_path):
+            imported = store.migrate_from_json(json_path)
+            if imported:
+                print(f"[INFO] Migrated {imported} records from {json_path} into {table}")
+        return store
+    raise ValueError(f"Unknown journal store backend: {backend!r} (use 'sqlite' or 'json')")
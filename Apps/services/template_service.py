@@ -0,0 +1,136 @@
+# File: Apps/services/template_service.py
+from Apps.config import Config
+from Apps.library_import import re, threading, Optional
+from Apps.library_import import Environment, FileSystemLoader, FileSystemBytecodeCache
+from Apps.library_import import pathOfPathLib
+
+
+class TemplateService:
+    """
+    Process-wide Jinja environments for the journal templates (Apps/templates).
+
+    The HTML and LaTeX environments are built once, on first use, with their
+    filters registered and a bytecode cache on disk, so rendering a journal only
+    executes the already compiled template. Template files are only re-checked
+    for changes when `Config.TEMPLATE_AUTO_RELOAD` is on (APP_ENV=dev).
+    """
+
+    TEMPLATE_DIR = pathOfPathLib(__file__).resolve().parent.parent / "templates"
+    CACHE_DIR = pathOfPathLib(__file__).resolve().parent.parent / "DB" / "JinjaCache"
+    AUTO_RELOAD = Config.TEMPLATE_AUTO_RELOAD
+
+    # Applied in order with str.replace (much faster than a regex callback).
+    # "\\" is parked on a NUL sentinel first so the braces/backslashes the
+    # later escapes introduce are not escaped again.
+    LATEX_ESCAPES = (
+        ("\\", "\0"),
+        ("&", r"\&"),
+        ("%", r"\%"),
+        ("$", r"\$"),
+        ("#", r"\#"),
+        ("_", r"\_"),
+        ("{", r"\{"),
+        ("}", r"\}"),
+        ("^", r"\^{}"),
+        ("~", r"\textasciitilde{}"),
+        ("\0", r"\textbackslash{}"),
+        # Placeholders the pipeline wraps around Irjesti citations -> \textbf{...}
+        ("rizzBro", r"\textbf{"),
+        ("hoez", "}"),
+    )
+    # The same mapping as one single-pass regex (fast-path check and fallback)
+    LATEX_REPLACEMENTS = {
+        ("\\" if char == "\0" else char): escaped for char, escaped in LATEX_ESCAPES[1:]
+    }
+    LATEX_PATTERN = re.compile("|".join(re.escape(k) for k in LATEX_REPLACEMENTS))
+    JOURNAL_NAME_PATTERN = re.compile(r"(\s)([A-Z][A-Za-z\.\s]+)(?=\s\d|\s\(|;)")
+
+    _lock = threading.Lock()
+    _html_env: Optional[Environment] = None
+    _latex_env: Optional[Environment] = None
+
+    # ==========================
+    # 🧩 Environments
+    # ==========================
+    @staticmethod
+    def html_env() -> Environment:
+        if TemplateService._html_env is None:
+            with TemplateService._lock:
+                if TemplateService._html_env is None:
+                    TemplateService._html_env = Environment(
+                        **TemplateService._common_options()
+                    )
+        return TemplateService._html_env
+
+    @staticmethod
+    def latex_env() -> Environment:
+        if TemplateService._latex_env is None:
+            with TemplateService._lock:
+                if TemplateService._latex_env is None:
+                    env = Environment(
+                        block_start_string=r"\BLOCK{",
+                        block_end_string="}",
+                        variable_start_string=r"\VAR{",
+                        variable_end_string="}",
+                        comment_start_string=r"\#{",
+                        comment_end_string="}",
+                        line_statement_prefix="%%",
+                        line_comment_prefix="%#",
+                        trim_blocks=True,
+                        autoescape=False,
+                        **TemplateService._common_options(),
+                    )
+                    env.filters["latex_escape"] = TemplateService.latex_escape
+                    env.filters["format_reference"] = TemplateService.format_reference
+                    TemplateService._latex_env = env
+        return TemplateService._latex_env
+
+    @staticmethod
+    def html_template(name: str):
+        return TemplateService.html_env().get_template(name)
+
+    @staticmethod
+    def latex_template(name: str):
+        return TemplateService.latex_env().get_template(name)
+
+    # ==========================
+    # 🔤 LaTeX filters
+    # ==========================
+    @staticmethod
+    def latex_escape(text):
+        if not isinstance(text, str):
+            return text
+        # Fast path: most fields (names, dates, plain sentences) need no escaping
+        if not TemplateService.LATEX_PATTERN.search(text):
+            return text
+        if "\0" in text:  # would clash with the sentinel; take the regex path
+            return TemplateService.LATEX_PATTERN.sub(
+                lambda m: TemplateService.LATEX_REPLACEMENTS[m.group()], text
+            )
+        for char, escaped in TemplateService.LATEX_ESCAPES:
+            if char in text:
+                text = text.replace(char, escaped)
+        return text
+
+    @staticmethod
+    def format_reference(ref):
+        """Escape a reference and italicise the journal name in it."""
+        if not isinstance(ref, str):
+            return ref
+        return TemplateService.JOURNAL_NAME_PATTERN.sub(
+            lambda m: f" \\textit{{{m.group(2).strip()}}}",
+            TemplateService.latex_escape(ref),
+            count=1,
+        )
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    @staticmethod
+    def _common_options() -> dict:
+        TemplateService.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return {
+            "loader": FileSystemLoader(TemplateService.TEMPLATE_DIR),
+            "bytecode_cache": FileSystemBytecodeCache(str(TemplateService.CACHE_DIR)),
+            "auto_reload": TemplateService.AUTO_RELOAD,
+        }
@@ -1,9 +1,56 @@
 # File: Apps/services/translate_service.py
-from Apps.library_import import GoogleTranslator, Dict, Any, time
+from Apps.config import Config
+from Apps.library_import import GoogleTranslator, ThreadPoolExecutor, Dict, Any, List, Optional, threading
+from Apps.library_import import (
+    InvalidSourceOrTargetLanguage,
+    LanguageNotSupportedException,
+    NotValidLength,
+    NotValidPayload,
+)
+from Apps.library_import import pathOfPathLib
+from Apps.services.translation_memory import TranslationMemory
+from Apps.services.retry_policy import RetryPolicy
+from Apps.services.upstream_guard import UpstreamGuard
 
 
 class TranslationService:
-    """Service class for text and dictionary translation."""
+    """
+    Service class for text and dictionary translation.
+
+    Texts are handled paragraph by paragraph: paragraphs found in the
+    persistent `TranslationMemory` are reused, and the remaining ones are
+    chunked and translated concurrently on one process-wide thread pool
+    (`TRANSLATE_WORKERS`), then reassembled in order. GoogleTranslator
+    keeps per-request state on the instance, so each worker thread reuses its
+    own translator per target language instead of creating one per chunk.
+    """
+
+    MEMORY_FILE = pathOfPathLib(__file__).resolve().parent.parent / "DB" / "translationMemory.sqlite3"
+
+    # Bad language codes / payloads will not succeed on a retry
+    TRANSLATE_RETRY = RetryPolicy(
+        "Google Translate",
+        attempts=Config.TRANSLATE_RETRY_ATTEMPTS,
+        max_delay=8.0,
+        deadline=Config.TRANSLATE_RETRY_DEADLINE,
+        retry_on=lambda e: RetryPolicy.is_transient(e)
+        and not isinstance(
+            e,
+            (
+                InvalidSourceOrTargetLanguage,
+                LanguageNotSupportedException,
+                NotValidLength,
+                NotValidPayload,
+            ),
+        ),
+    )
+
+    TRANSLATE_GUARD = UpstreamGuard.get("translate")
+
+    _executor = None
+    _memory = None
+    _lock = threading.Lock()
+    _local = threading.local()
 
     def __init__(self, max_len: int = 4900):
         """
@@ -17,7 +64,7 @@ class TranslationService:
     # ==========================
     def split_and_translate(self, text: str, dest_lang: str) -> str:
         """
-        Splits large text into manageable chunks and translates each chunk separately.
+        Splits large text into paragraphs and translates the new ones in parallel chunks.
 
         Args:
             text (str): Input text to translate.
@@ -26,28 +73,39 @@ class TranslationService:
         Returns:
             str: The fully translated text.
         """
-        if not text:
-            return ""
+        return self.translate_many([text], dest_lang)[0]
 
-        # If text is short enough, translate directly
-        if len(text) <= self.max_len:
-            return self._safe_translate(text, dest_lang)
+    def translate_many(self, texts: List[str], dest_lang: str) -> List[str]:
+        """
+        Translate several texts at once, paragraph by paragraph.
 
-        paragraphs = text.split("\n\n")  # preserve logical paragraph breaks
-        chunks, current = [], ""
+        Paragraphs already in the translation memory are reused; the rest are
+        grouped into chunks of at most `max_len` characters, all submitted to
+        the shared pool, and every text is reassembled in order.
+        """
+        split_texts = [text.split("\n\n") if text else [] for text in texts]
+        # Unique non-blank paragraphs, in document order
+        paragraphs = list(dict.fromkeys(p for parts in split_texts for p in parts if p.strip()))
 
-        for para in paragraphs:
-            if len(current) + len(para) + 2 <= self.max_len:
-                current += para + "\n\n"
-            else:
-                chunks.append(current.strip())
-                current = para + "\n\n"
-        if current.strip():
-            chunks.append(current.strip())
+        memory = TranslationService._get_memory()
+        known = memory.lookup(paragraphs, dest_lang) if memory else {}
 
-        translated_chunks = [self._safe_translate(chunk, dest_lang) for chunk in chunks]
+        executor = TranslationService._get_executor()
+        futures = [
+            executor.submit(self._translate_chunk, chunk, dest_lang)
+            for chunk in self._chunk([p for p in paragraphs if p not in known])
+        ]
+        fresh = {}
+        for future in futures:
+            fresh.update(future.result())
+        if memory:
+            memory.store(fresh, dest_lang)
+        known.update(fresh)
 
-        return "\n\n".join(translated_chunks)
+        return [
+            "\n\n".join(known.get(p, p) if p.strip() else p for p in parts)
+            for parts in split_texts
+        ]
 
     # ==========================
     # 🧠 Dictionary Translation
@@ -65,25 +123,97 @@ class TranslationService:
         Returns:
             dict: Dictionary with translated values.
         """
-        translated = {}
-        for key, value in input_dict.items():
-            if isinstance(value, str):
-                translated[key] = self.split_and_translate(value, dest_lang)
-            else:
-                translated[key] = value  # leave non-string data unchanged
+        keys = [key for key, value in input_dict.items() if isinstance(value, str)]
+        translated = dict(input_dict)  # leave non-string data unchanged
+        results = self.translate_many([input_dict[key] for key in keys], dest_lang)
+        translated.update(zip(keys, results))
         return translated
 
     # ==========================
-    # 🛡️ Private Helper
+    # 🛡️ Private Helpers
     # ==========================
-    def _safe_translate(self, text: str, dest_lang: str) -> str:
-        """Safely call the translation API with basic retry logic."""
+    def _chunk(self, paragraphs: List[str]) -> List[List[str]]:
+        """Group paragraphs into requests of at most `max_len` characters."""
+        chunks, current, size = [], [], 0
+        for para in paragraphs:
+            if current and size + len(para) + 2 > self.max_len:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(para)
+            size += len(para) + 2
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate_chunk(self, paragraphs: List[str], dest_lang: str) -> Dict[str, str]:
+        """
+        Translate a group of paragraphs in one request. Returns only the
+        paragraphs that were actually translated (failures fall back to the
+        original text later and are not remembered).
+        """
+        translated = self._safe_translate("\n\n".join(paragraphs), dest_lang, fallback=False)
+        if translated is None:
+            return {}
+        parts = translated.split("\n\n")
+        if len(paragraphs) == 1:
+            return {paragraphs[0]: translated}
+        if len(parts) == len(paragraphs):
+            return dict(zip(paragraphs, parts))
+
+        # Paragraph breaks were not preserved: translate them one by one
+        results = {}
+        for para in paragraphs:
+            part = self._safe_translate(para, dest_lang, fallback=False)
+            if part is not None:
+                results[para] = part
+        return results
+
+    def _safe_translate(self, text: str, dest_lang: str, fallback: bool = True) -> Optional[str]:
+        """
+        Call the translation API with `TRANSLATE_RETRY` (backoff + jitter).
+        On failure returns the original text, or None when `fallback` is False.
+        """
         try:
-            return GoogleTranslator(source="auto", target=dest_lang).translate(text)
+            return TranslationService.TRANSLATE_RETRY.run_sync(
+                TranslationService.TRANSLATE_GUARD.call_sync,
+                lambda: TranslationService._translator(dest_lang).translate(text),
+            )
         except Exception as e:
-            print(f"[WARN] Translation failed: {e}. Retrying...")
-            time.sleep(2)
-            try:
-                return GoogleTranslator(source="auto", target=dest_lang).translate(text)
-            except Exception:
-                return text  # fallback to original if all retries fail
+            print(f"[WARN] Translation failed: {e}")
+            return text if fallback else None  # fallback to original if all retries fail
+
+    @staticmethod
+    def _translator(dest_lang: str) -> GoogleTranslator:
+        """This thread's translator for `dest_lang` (created on first use)."""
+        translators = getattr(TranslationService._local, "translators", None)
+        if translators is None:
+            translators = TranslationService._local.translators = {}
+        if dest_lang not in translators:
+            translators[dest_lang] = GoogleTranslator(source="auto", target=dest_lang)
+        return translators[dest_lang]
+
+    @staticmethod
+    def _get_memory() -> Optional[TranslationMemory]:
+        if TranslationService._memory is None and Config.TRANSLATION_MEMORY_MAX_ENTRIES > 0:
+            with TranslationService._lock:
+                if TranslationService._memory is None:
+                    TranslationService._memory = TranslationMemory(
+                        TranslationService.MEMORY_FILE, Config.TRANSLATION_MEMORY_MAX_ENTRIES
+                    )
+        return TranslationService._memory
+
+    @staticmethod
+    def memory_metrics() -> Optional[Dict[str, Any]]:
+        memory = TranslationService._get_memory()
+        return memory.metrics() if memory else None
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        if TranslationService._executor is None:
+            with TranslationService._lock:
+                if TranslationService._executor is None:
+                    TranslationService._executor = ThreadPoolExecutor(
+                        max_workers=Config.TRANSLATE_WORKERS,
+                        thread_name_prefix="translate",
+                    )
+        return TranslationService._executor
@@ -0,0 +1,117 @@
+# File: Apps/services/translation_memory.py
+from Apps.library_import import sqlite3, threading, time, hashlib, Dict, Any, List
+from Apps.library_import import pathOfPathLib
+
+
+class TranslationMemory:
+    """
+    SQLite-backed translation memory: one row per (source text, target language),
+    keyed by a SHA-256 of both. Rows remember when they were last used, and the
+    least recently used ones are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(self, db_path: pathOfPathLib, max_entries: int):
+        self.db_path = pathOfPathLib(db_path)
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        # Lookups and stores run on the translation worker threads
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translation_memory ("
+                    "key TEXT PRIMARY KEY, "
+                    "lang TEXT NOT NULL, "
+                    "translation TEXT NOT NULL, "
+                    "last_used REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS translation_memory_last_used "
+                    "ON translation_memory (last_used)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def key(text: str, lang: str) -> str:
+        return hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def lookup(self, texts: List[str], lang: str) -> Dict[str, str]:
+        """Known translations for `texts` (missing ones are simply absent)."""
+        keys = {TranslationMemory.key(text, lang): text for text in set(texts)}
+        found = {}
+        conn = self._connect()
+        try:
+            with conn:
+                key_list = list(keys)
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(key_list), 500):
+                    batch = key_list[start:start + 500]
+                    rows = conn.execute(
+                        "SELECT key, translation FROM translation_memory "
+                        f"WHERE key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    ).fetchall()
+                    for key, translation in rows:
+                        found[keys[key]] = translation
+                    conn.executemany(
+                        "UPDATE translation_memory SET last_used = ? WHERE key = ?",
+                        [(time.time(), key) for key, _ in rows],
+                    )
+        finally:
+            conn.close()
+        with self._lock:
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def store(self, translations: Dict[str, str], lang: str) -> None:
+        """Remember `source text -> translation` pairs, then evict if over the limit."""
+        if not translations:
+            return
+        evicted = 0
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translation_memory (key, lang, translation, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (TranslationMemory.key(text, lang), lang, translation, time.time())
+                        for text, translation in translations.items()
+                    ],
+                )
+                excess = (
+                    conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+                    - self.max_entries
+                )
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM translation_memory WHERE key IN ("
+                        "SELECT key FROM translation_memory ORDER BY last_used LIMIT ?)",
+                        (excess,),
+                    )
+                    evicted = excess
+        finally:
+            conn.close()
+        with self._lock:
+            self.stats["stores"] += len(translations)
+            self.stats["evictions"] += evicted
+
+    def metrics(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            entries = conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        finally:
+            conn.close()
+        with self._lock:
+            stats = dict(self.stats)
+        return {**stats, "entries": entries, "max_entries": self.max_entries}
@@ -2,6 +2,9 @@ from Apps.library_import import *
 from Apps.library_import import pathOfPathLib
 from Apps.services.io_service import IOService
 from Apps.services.translate_service import TranslationService
+from Apps.services.compile_service import CompileService
+from Apps.services.template_service import TemplateService
+from Apps.services.citation_service import CitationService
 from Apps.language_fonts import LatexLanguageConfig
 from Apps.models_journal import TranslatePage
 
@@ -11,17 +14,90 @@ class TranslationPipelineService:
     Handles translation of journal outputs (PDF + HTML) into target language.
     """
 
+    translator = TranslationService()
+
     @staticmethod
     async def translate_journal(translatePage: TranslatePage):
         print("Start the process of translation ✅")
 
-        output_data = IOService.fetch_output_data()
-        if translatePage.id not in output_data:
+        journal_data = TranslationPipelineService._fetch_source(translatePage.id)
+        await TranslationPipelineService._translate_one(
+            journal_data, translatePage.id, translatePage.language
+        )
+
+        # -------- Step 5: Done --------
+        return JSONResponse(
+            status_code=200,
+            content={
+                "Status": f"Translated files generated successfully in PDFTranslatedStorePulsus/{translatePage.id}/ ✅"
+            },
+        )
+
+    @staticmethod
+    async def translate_many(page_id: str, languages: List[str]):
+        """
+        Translate one journal into several languages concurrently.
+
+        The source record is read once; every language then translates,
+        renders and compiles on the shared translation and xelatex pools.
+        Async generator over per-language result dicts in completion order,
+        followed by one final {"summary": {...}} dict.
+        """
+        journal_data = TranslationPipelineService._fetch_source(page_id)
+        started = time.time()
+
+        async def run(language: str):
+            item = {"language": language}
+            try:
+                folder = await TranslationPipelineService._translate_one(
+                    copy.deepcopy(journal_data), page_id, language
+                )
+                item.update(
+                    status="succeeded",
+                    html=str(folder / f"{page_id}.html"),
+                    pdf=str(folder / f"{page_id}.pdf"),
+                )
+            except HTTPException as e:
+                item.update(status="failed", error=e.detail)
+            except Exception as e:
+                item.update(status="failed", error=str(e))
+            item["elapsed"] = round(time.time() - started, 2)
+            return item
+
+        tasks = [asyncio.create_task(run(language)) for language in languages]
+        counts = {"succeeded": 0, "failed": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                counts[item["status"]] += 1
+                yield item
+        finally:
+            # Consumer went away (e.g. client disconnected): stop outstanding work
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "summary": {
+                **counts,
+                "id": page_id,
+                "elapsed": round(time.time() - started, 2),
+            }
+        }
+
+    @staticmethod
+    def _fetch_source(page_id: str):
+        journal_data = IOService.fetchOutputById(page_id)
+        if journal_data is None:
             details = "Journal ID doesn't exist. Available IDs:"
-            details += " ".join(output_data.keys())
+            details += " ".join(IOService.listOutputIds())
             raise HTTPException(status_code=404, detail=details)
+        return journal_data
 
-        journal_data = output_data[translatePage.id]
+    @staticmethod
+    async def _translate_one(journal_data, page_id: str, language: str):
+        """Translate, render HTML and compile the PDF for one language. Returns the output folder."""
+        translatePage = TranslatePage(id=page_id, language=language)
+        output_data = {page_id: journal_data}
 
         # -------- Step 1: Translation --------
         tempStore = {
@@ -32,39 +108,35 @@ class TranslationPipelineService:
             "conclusion": journal_data["conclusion"],
         }
 
-        print("Step 1: Start Translation ✅")
-        translated = TranslationService.translate_dict(tempStore, translatePage.language)
+        print(f"Step 1: Start Translation ({language}) ✅")
+        # Chunks of all sections are translated in parallel, off the event loop
+        translated = await asyncio.to_thread(
+            TranslationPipelineService.translator.translate_dict,
+            tempStore,
+            language,
+        )
 
         for key, value in translated.items():
             journal_data[key] = value
 
         # -------- Step 2: Directory Setup --------
         output_base_dir = pathOfPathLib("Apps/DB/PDFTranslatedStorePulsus")
-        journal_folder = (
-            output_base_dir / f"{translatePage.language}_translate_{translatePage.id}"
-        )
+        journal_folder = output_base_dir / f"{language}_translate_{page_id}"
         journal_folder.mkdir(parents=True, exist_ok=True)
-        print("Step 2: Folder ready ✅")
+        print(f"Step 2: Folder ready ({language}) ✅")
 
         # -------- Step 3: HTML Generation --------
         TranslationPipelineService._generate_html(
             journal_data, journal_folder, translatePage
         )
-        print("Step 3: Created HTML ✅")
+        print(f"Step 3: Created HTML ({language}) ✅")
 
         # -------- Step 4: PDF Generation --------
-        TranslationPipelineService._generate_pdf(
+        await TranslationPipelineService._generate_pdf(
             journal_data, journal_folder, translatePage, output_data
         )
-        print("Step 4: Created PDF ✅")
-
-        # -------- Step 5: Done --------
-        return JSONResponse(
-            status_code=200,
-            content={
-                "Status": f"Translated files generated successfully in PDFTranslatedStorePulsus/{translatePage.id}/ ✅"
-            },
-        )
+        print(f"Step 4: Created PDF ({language}) ✅")
+        return journal_folder
 
     # ------------------------------------------------------------------------
     # Helper Methods
@@ -72,18 +144,13 @@ class TranslationPipelineService:
 
     @staticmethod
     def _generate_html(journal_data, journal_folder, translatePage: TranslatePage):
-        env_html = Environment(loader=FileSystemLoader(pathOfPathLib("Apps/templates/")))
-        html_template = env_html.get_template("Format1.html")
+        html_template = TemplateService.html_template("Format.html")
         forHtml = copy.deepcopy(journal_data)
 
         # Replace references
-        for i in range(1, len(forHtml["content"]) + 1):
-            forHtml["introduction"] = forHtml["introduction"].replace(
-                f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>].</p><p>"
-            )
-            forHtml["description"] = forHtml["description"].replace(
-                f"[{i}].", f"[<a href='#{i}' title='{i}'>{i}</a>]."
-            )
+        citations = CitationService.html_table(forHtml["content"], "")
+        CitationService.link_sections(forHtml, ("introduction",), citations, suffix="</p><p>")
+        CitationService.link_sections(forHtml, ("description",), citations)
 
         forHtml["description"] = forHtml["description"].replace("\n\n", "</p><p>")
         forHtml["description"] = forHtml["description"].replace("\n", "</p><p>")
@@ -157,7 +224,7 @@ class TranslationPipelineService:
             count += 1
             item["issues"] = f"({item['issues']})" if item.get("issues") else ""
             base_ref = (
-                f"<li><i><a name='{count}' id='{count}'></a>{item['authors']}. "
+                f"<li><i><a name='{count}' id='{count}'></a>{item['authors_short']}. "
                 f"<a href='{item['parentLink']}' target='_blank'>{item['title']}</a>. "
                 f"{item['journalShortName']}. {item['published']};{item['volume']}{item['issues']}:{item['pageRangeOrNumber']}.</i></li>"
             )
@@ -170,58 +237,12 @@ class TranslationPipelineService:
         return ref_html
 
     @staticmethod
-    def _generate_pdf(journal_data, journal_folder, translatePage, output_data):
-        env_latex = Environment(
-            block_start_string=r"\BLOCK{",
-            block_end_string="}",
-            variable_start_string=r"\VAR{",
-            variable_end_string="}",
-            comment_start_string=r"\#{",
-            comment_end_string="}",
-            line_statement_prefix="%%",
-            line_comment_prefix="%#",
-            trim_blocks=True,
-            autoescape=False,
-            loader=FileSystemLoader(pathOfPathLib("./templates")),
-        )
-
-        # Escape + reference formatting filters
-        def latex_escape(text):
-            if not isinstance(text, str):
-                return text
-            replacements = {
-                "&": r"\&",
-                "%": r"\%",
-                "$": r"\$",
-                "#": r"\#",
-                "_": r"\_",
-                "{": r"\{",
-                "}": r"\}",
-                "^": r"\^{}",
-                "~": r"\textasciitilde{}",
-                "\\": r"\textbackslash{}",
-            }
-            pattern = re.compile("|".join(re.escape(k) for k in replacements.keys()))
-            return pattern.sub(lambda m: replacements[m.group()], text)
-
-        def format_reference(ref: str) -> str:
-            if not isinstance(ref, str):
-                return ref
-            ref = latex_escape(ref)
-            pattern = r"(\s)([A-Z][A-Za-z\.\s]+)(?=\s\d|\s\(|;)"
-
-            def repl(match):
-                return f" \\textit{{{match.group(2).strip()}}}"
-
-            return re.sub(pattern, repl, ref, count=1)
-
-        env_latex.filters["latex_escape"] = latex_escape
-        env_latex.filters["format_reference"] = format_reference
-        template = env_latex.get_template(journal_data["brandName"])
+    async def _generate_pdf(journal_data, journal_folder, translatePage, output_data):
+        template = TemplateService.latex_template(journal_data["brandName"])
 
         # Determine language setup
         brand_key = journal_data["brandName"].replace(".tex", "")
-        lang_map = LatexLanguageConfig.get_lang_map(brand_key)
+        lang_map = LatexLanguageConfig().get_lang_map(brand_key)
 
         target_lang = translatePage.language or output_data[translatePage.id].get(
             "lang", "en"
@@ -252,20 +273,7 @@ class TranslationPipelineService:
         tex_file_path = journal_folder / f"{translatePage.id}.tex"
         tex_file_path.write_text(rendered_latex, encoding="utf-8")
 
-        # Compile to PDF
-        for i in range(2):
-            result = subprocess.run(
-                ["xelatex", "-interaction=nonstopmode", tex_file_path.name],
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                cwd=journal_folder,
-            )
-            if result.returncode != 0:
-                log_path = tex_file_path.with_suffix(".log")
-                error_text = "LaTeX compilation failed."
-                if log_path.exists():
-                    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                        errors = [line for line in f if line.startswith("! ")]
-                    error_text = "\n".join(errors) or f"Full log in {log_path}"
-                raise HTTPException(status_code=500, detail=error_text)
+        # Compile to PDF on the shared compile pool
+        result = await CompileService.compile(tex_file_path, format_name=brand_key)
+        if not result["ok"]:
+            raise HTTPException(status_code=500, detail=result["error"])
@@ -0,0 +1,213 @@
+# File: Apps/services/upstream_guard.py
+from Apps.config import Config
+from Apps.library_import import asyncio, threading, time, Dict, Any, Optional
+from Apps.services.retry_policy import RetryPolicy
+from contextlib import asynccontextmanager
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    status_code = 503
+    retryable = False  # RetryPolicy must not spin on an open circuit
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(
+            f"{name} is temporarily unavailable (circuit open); retry in {self.retry_after}s"
+        )
+
+
+class UpstreamGuard:
+    """
+    Concurrency limit + circuit breaker for one upstream API.
+
+    - At most `max_concurrency` calls are in flight. Async callers share an
+      asyncio.Semaphore and thread callers a threading.Semaphore, each with
+      that limit.
+    - After `failure_threshold` consecutive transient failures (429/5xx,
+      network errors) the circuit opens and calls fail fast with
+      `CircuitOpenError` for `reset_timeout` seconds. Then it is half-open:
+      one probe call goes through, and its outcome closes or re-opens it.
+
+    One guard per provider, shared process-wide via `UpstreamGuard.get(name)`.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    _registry: Dict[str, "UpstreamGuard"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        failure_threshold: int = Config.BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = Config.BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+
+        self.state = UpstreamGuard.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._thread_slots = threading.Semaphore(self.max_concurrency)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._async_loop = None
+        self._stats = {
+            "calls": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0,
+            "in_flight": 0,
+        }
+
+    @staticmethod
+    def get(name: str) -> "UpstreamGuard":
+        """The shared guard for `name` ("gemini", "groq", "core", "translate")."""
+        guard = UpstreamGuard._registry.get(name)
+        if guard is None:
+            with UpstreamGuard._registry_lock:
+                guard = UpstreamGuard._registry.get(name)
+                if guard is None:
+                    guard = UpstreamGuard._registry[name] = UpstreamGuard(
+                        name, Config.UPSTREAM_CONCURRENCY.get(name, 4)
+                    )
+        return guard
+
+    @staticmethod
+    def all_metrics() -> Dict[str, Any]:
+        return {name: guard.metrics() for name, guard in UpstreamGuard._registry.items()}
+
+    # ==========================
+    # 🛡️ Guarded calls
+    # ==========================
+    async def call(self, func, *args, **kwargs):
+        """Await `func(*args, **kwargs)` within the limit and the breaker."""
+        async with self.slot():
+            return await func(*args, **kwargs)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one call slot for the body of an `async with` block, e.g. for the
+        whole length of a streamed response. An exception leaving the block
+        counts as a failure; cancellation (client went away) counts as neither.
+        """
+        self._before_call()
+        loop = asyncio.get_running_loop()
+        if self._async_slots is None or self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._async_slots:
+                with self._lock:
+                    self._stats["in_flight"] += 1
+                try:
+                    yield
+                except Exception as e:
+                    self._record_failure(e)
+                    raise
+                finally:
+                    with self._lock:
+                        self._stats["in_flight"] -= 1
+                self._record_success()
+        except BaseException:
+            self._release_probe()
+            raise
+
+    def call_sync(self, func, *args, **kwargs):
+        """Blocking variant for thread callers (sync routes, translation pool)."""
+        self._before_call()
+        try:
+            with self._thread_slots:
+                return self._observe_sync(func, *args, **kwargs)
+        except BaseException:
+            self._release_probe()
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == UpstreamGuard.OPEN:
+                retry_in = round(max(0.0, self._opened_at + self.reset_timeout - time.time()), 1)
+            return {
+                **self._stats,
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "max_concurrency": self.max_concurrency,
+                "retry_in": retry_in,
+            }
+
+    # ==========================
+    # 🧱 Internal helpers
+    # ==========================
+    def _observe_sync(self, func, *args, **kwargs):
+        with self._lock:
+            self._stats["in_flight"] += 1
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+        self._record_success()
+        return result
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == UpstreamGuard.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.time()
+                if remaining > 0:
+                    self._stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self.state = UpstreamGuard.HALF_OPEN
+                print(f"[INFO] {self.name} circuit half-open: probing")
+            if self.state == UpstreamGuard.HALF_OPEN:
+                if self._probing:
+                    self._stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, 1)
+                self._probing = True
+            self._stats["calls"] += 1
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self.state != UpstreamGuard.CLOSED:
+                print(f"[INFO] {self.name} circuit closed")
+            self.state = UpstreamGuard.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def _record_failure(self, exc: Exception) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            if not RetryPolicy.is_transient(exc):
+                # The upstream answered (e.g. 400): it is healthy, the request was not
+                self._failures = 0
+                if self.state == UpstreamGuard.HALF_OPEN:
+                    self.state = UpstreamGuard.CLOSED
+                self._probing = False
+                return
+            self._failures += 1
+            if self.state == UpstreamGuard.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != UpstreamGuard.OPEN:
+                    self._stats["opened"] += 1
+                    print(
+                        f"[WARN] {self.name} circuit open for {self.reset_timeout:.0f}s "
+                        f"after {self._failures} failures: {exc}"
+                    )
+                self.state = UpstreamGuard.OPEN
+                self._opened_at = time.time()
+            self._probing = False
+
+    def _release_probe(self) -> None:
+        """A probe that ended without an outcome (e.g. cancelled) frees the slot."""
+        with self._lock:
+            if self.state == UpstreamGuard.HALF_OPEN:
+                self._probing = False
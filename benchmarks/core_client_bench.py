@@ -0,0 +1,119 @@
+"""
+Benchmark for the CORE search HTTP client.
+
+Starts a local stub of the CORE search endpoint and fires concurrent
+searches at it in two ways: the legacy pattern (a fresh `httpx.AsyncClient`,
+hence a fresh connection, per search) and the pooled keep-alive client
+from `LLMService.core_client()`. Reports latency percentiles, throughput and
+how many TCP connections the stub had to accept.
+
+Usage (from the repository root):
+    python -m benchmarks.core_client_bench [--requests 400] [--concurrency 20] [--delay-ms 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from Apps.services.llm_service import LLMService
+
+
+class StubCoreServer:
+    """Minimal HTTP/1.1 keep-alive server answering every POST with a CORE-like JSON body."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+        self.body = json.dumps(
+            {
+                "results": [
+                    {"title": f"Work {i}", "abstract": "Lorem ipsum " * 40, "authors": [{"name": "A"}]}
+                    for i in range(20)
+                ]
+            }
+        ).encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n" % len(self.body) + self.body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(label, search, total: int, concurrency: int, server: StubCoreServer) -> None:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with gate:
+            start = time.perf_counter()
+            await search()
+            latencies.append(time.perf_counter() - start)
+
+    server.connections = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<24} p50 {statistics.median(latencies) * 1e3:7.2f} ms   "
+        f"p95 {p95 * 1e3:7.2f} ms   {total / elapsed:8.1f} req/s   "
+        f"{server.connections:4d} connections"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="CORE client micro-benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="stub server think time")
+    args = parser.parse_args()
+
+    server = StubCoreServer(args.delay_ms / 1000)
+    stub = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{stub.sockets[0].getsockname()[1]}/v3/search/works"
+    payload = {"q": "primary explosives", "limit": 20}
+
+    async def per_request_client():
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    async def pooled_client():
+        response = await LLMService.core_client().post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    print(f"{args.requests} searches, concurrency {args.concurrency}, stub delay {args.delay_ms} ms")
+    await run("client per request", per_request_client, args.requests, args.concurrency, server)
+    await LLMService.start()
+    await run("pooled client", pooled_client, args.requests, args.concurrency, server)
+    await LLMService.stop()
+
+    stub.close()
+    await stub.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
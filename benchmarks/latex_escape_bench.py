@@ -0,0 +1,130 @@
+"""
+Micro-benchmark for the LaTeX `latex_escape` filter.
+
+Compares the legacy filter (replacement dict + alternation regex rebuilt on
+every call) with `TemplateService.latex_escape`, both on the raw fields of a
+journal and on a full render of a brand template.
+
+Usage (from the repository root):
+    python -m benchmarks.latex_escape_bench [--runs 200] [--brand omics.tex]
+"""
+import argparse
+import copy
+import re
+import timeit
+
+from Apps.services.template_service import TemplateService
+
+
+def legacy_latex_escape(text):
+    """The filter as it was defined inside the pipelines before TemplateService."""
+    if not isinstance(text, str):
+        return text
+    replacements = {
+        "&": r"\&",
+        "%": r"\%",
+        "$": r"\$",
+        "#": r"\#",
+        "_": r"\_",
+        "{": r"\{",
+        "}": r"\}",
+        "^": r"\^{}",
+        "~": r"\textasciitilde{}",
+        "\\": r"\textbackslash{}",
+        "rizzBro": r"\textbf{",
+        "hoez": r"}",
+    }
+    pattern = re.compile("|".join(re.escape(k) for k in replacements.keys()))
+    return pattern.sub(lambda m: replacements[m.group()], text)
+
+
+def sample_record() -> dict:
+    paragraph = (
+        "Primary explosives initiate detonation in secondary charges; "
+        "their sensitivity & performance vary by up to 40% between classes [1]. "
+        "Lead azide (Pb(N_3)_2) remains common, yet greener #alternatives exist [2]. "
+    )
+    content = {
+        f"C{i:03d}": {
+            "title": f"A Review on Primary Explosives: Progress & Prospects {i}",
+            "journalShortName": "J. Hazard. Mater.",
+            "authors_full": "Sachin Chavan, Satish Kumar Sharma, Ashok Kumar Singh.",
+            "authors_short": "Sachin C, Satish KS, Ashok KS.",
+            "published": "2022",
+            "pageRangeOrNumber": "e202200030",
+            "volume": "47",
+            "issues": "6",
+            "DOI": "10.1002/prep.202200030",
+            "url": "https://pubmed.ncbi.nlm.nih.gov/?term=Propellants",
+            "parentLink": "https://onlinelibrary.wiley.com/doi/10.1002/prep.202200030",
+        }
+        for i in range(1, 16)
+    }
+    return {
+        "title": "Advances in Green Primary Explosives",
+        "journalName": "Journal of Chemical Sciences",
+        "shortJournalName": "J Chem Sci",
+        "type": "Short Communication",
+        "author": "Jane Doe",
+        "firstNameAuthor": "Jane",
+        "authorsDepartment": "Department of Chemistry, University of Somewhere, Country",
+        "email": "jane_doe@example.com",
+        "abstract": paragraph * 3,
+        "keywords": "Explosives; Azides; Green chemistry",
+        "introduction": paragraph * 12,
+        "description": paragraph * 12,
+        "discussion": paragraph * 8,
+        "conclusion": paragraph * 4,
+        "citation": "Doe J. Advances in Green Primary Explosives. J Chem Sci. 2025;12(3):1-2.",
+        "content": content,
+        "preamble": "",
+        "lang_name": "english",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="latex_escape micro-benchmark")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--brand", default="omics.tex")
+    args = parser.parse_args()
+
+    record = sample_record()
+    fields = [v for v in record.values() if isinstance(v, str)] + [
+        v for ref in record["content"].values() for v in ref.values()
+    ]
+    fields.append("rizzBro(Sachin C et al., 2022).hoez")
+    for value in fields:
+        assert legacy_latex_escape(value) == TemplateService.latex_escape(value), value
+
+    def bench(label, func):
+        seconds = min(timeit.repeat(func, number=args.runs, repeat=5)) / args.runs
+        print(f"{label:<34} {seconds * 1e6:10.1f} µs")
+        return seconds
+
+    print(f"{len(fields)} fields, {args.runs} runs, best of 5")
+    old = bench("fields: legacy filter", lambda: [legacy_latex_escape(v) for v in fields])
+    new = bench("fields: TemplateService", lambda: [TemplateService.latex_escape(v) for v in fields])
+    print(f"{'speedup':<34} {old / new:10.1f} x")
+
+    # A private copy of the LaTeX environment running the legacy filter
+    legacy_env = TemplateService.latex_env().overlay(cache_size=0)
+    legacy_env.filters = {**legacy_env.filters, "latex_escape": legacy_latex_escape}
+    legacy_template = legacy_env.get_template(args.brand)
+    template = TemplateService.latex_template(args.brand)
+    assert template.render(**copy.deepcopy(record)) == legacy_template.render(
+        **copy.deepcopy(record)
+    )
+
+    old = bench(
+        f"render {args.brand}: legacy filter",
+        lambda: legacy_template.render(**copy.deepcopy(record)),
+    )
+    new = bench(
+        f"render {args.brand}: TemplateService",
+        lambda: template.render(**copy.deepcopy(record)),
+    )
+    print(f"{'speedup':<34} {old / new:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
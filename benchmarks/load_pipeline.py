@@ -0,0 +1,143 @@
+"""
+Offline load test of the journal pipeline against the fake LLM provider.
+
+Generates `--jobs` synthetic journals and runs them through
+`BatchService.run_manifest` (content generation, storage, HTML/PDF builds),
+or through the LLM stages only with `--llm-only`. Reports throughput,
+failures and the provider, upstream-guard, rate-limit and compile-pool
+metrics, so the stage that saturates first is visible.
+
+The fake provider needs no network or API key; shape it with
+FAKE_LLM_LATENCY, FAKE_LLM_JITTER, FAKE_LLM_ERROR_RATE and, to emulate
+real quotas, FAKE_LLM_RPM / FAKE_LLM_MAX_CONCURRENCY. The full pipeline
+stores the journals (ids "Lxxxxx") like any batch, so run it on a scratch
+checkout.
+
+Usage (from the repository root):
+    python -m benchmarks.load_pipeline [--jobs 200] [--llm-concurrency 16]
+        [--compile-concurrency 4] [--llm-only] [--brand omics.tex]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import sys
+import time
+
+parser = argparse.ArgumentParser(description="Offline load test of the journal pipeline")
+parser.add_argument("--jobs", type=int, default=200)
+parser.add_argument("--llm-concurrency", type=int, default=16)
+parser.add_argument("--compile-concurrency", type=int, default=4)
+parser.add_argument("--llm-only", action="store_true", help="skip storage and HTML/PDF builds")
+parser.add_argument("--brand", default="omics.tex")
+args = parser.parse_args()
+
+# Configuration is read at import time, so set it up before importing the app
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+
+from Apps.models_journal import PulsusInputStr  # noqa: E402
+from Apps.services.batch_service import BatchService  # noqa: E402
+from Apps.services.compile_service import CompileService  # noqa: E402
+from Apps.services.llm_providers import LLMProvider  # noqa: E402
+from Apps.services.pipeline_service import PipelineService  # noqa: E402
+from Apps.services.rate_limiter import RateLimiter  # noqa: E402
+from Apps.services.upstream_guard import UpstreamGuard  # noqa: E402
+
+
+def journals(count: int):
+    """`count` synthetic manifest items with unique ids and topics."""
+    ids = set()
+    rng = random.Random()
+    while len(ids) < count:
+        ids.add("L" + "".join(rng.choices(string.ascii_lowercase + string.digits, k=5)))
+    for n, journal_id in enumerate(sorted(ids), start=1):
+        yield {
+            "id": journal_id,
+            "topic": f"Load test topic {n}: catalysis of small molecules",
+            "journalName": "Journal of Load Testing",
+            "shortJournalName": "J Load Test",
+            "type": "Research Article",
+            "author": "Test Author",
+            "email": "author@example.com",
+            "brandName": args.brand,
+            "authorsDepartment": "Department of Chemistry",
+            "received": "2024-01-15",
+            "manuscriptNo": f"LT-{n:05d}",
+            "volume": 1,
+            "issues": 1,
+            "pdfNo": n,
+            "parentLink": "https://journal.example.com",
+        }
+
+
+async def run_full() -> tuple:
+    lines = (json.dumps(item) for item in journals(args.jobs))
+    failures, summary = [], {}
+    async for item in BatchService.run_manifest(
+        lines, args.llm_concurrency, args.compile_concurrency
+    ):
+        if "summary" in item:
+            summary = item["summary"]
+        elif item.get("status") == "failed":
+            failures.append(item.get("error"))
+    return failures, summary
+
+
+async def run_llm_only() -> tuple:
+    limit = asyncio.Semaphore(max(1, args.llm_concurrency))
+    latencies, failures = [], []
+
+    async def one(data: dict) -> None:
+        async with limit:
+            started = time.perf_counter()
+            try:
+                await PipelineService._generate_content(PulsusInputStr(**data))
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                failures.append(getattr(e, "detail", str(e)))
+
+    await asyncio.gather(*(one(data) for data in journals(args.jobs)))
+    latencies.sort()
+    summary = {}
+    if latencies:
+        summary = {
+            "p50_seconds": round(latencies[len(latencies) // 2], 2),
+            "p95_seconds": round(latencies[int(len(latencies) * 0.95)], 2),
+            "max_seconds": round(latencies[-1], 2),
+        }
+    return failures, summary
+
+
+async def main() -> int:
+    provider = PipelineService.PROVIDER
+    print(
+        f"{args.jobs} jobs on {provider.name}:{provider.model}, "
+        f"llm concurrency {args.llm_concurrency}"
+        + ("" if args.llm_only else f", compile concurrency {args.compile_concurrency}")
+    )
+    started = time.perf_counter()
+    failures, summary = await (run_llm_only() if args.llm_only else run_full())
+    elapsed = time.perf_counter() - started
+
+    done = args.jobs - len(failures)
+    print(f"\n{done}/{args.jobs} succeeded in {elapsed:.1f}s: {done * 3600 / elapsed:,.0f} jobs/hour")
+    if summary:
+        print(f"summary: {json.dumps(summary, default=str)}")
+    for error in failures[:5]:
+        print(f"failed: {error}")
+    metrics = {
+        "llm_providers": LLMProvider.all_metrics(),
+        "upstreams": UpstreamGuard.all_metrics(),
+        "rate_limits": RateLimiter.all_metrics(),
+    }
+    if not args.llm_only:
+        metrics["compile"] = CompileService.metrics()
+    print(json.dumps(metrics, indent=2, default=str))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
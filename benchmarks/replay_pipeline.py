@@ -0,0 +1,138 @@
+"""
+Offline harness for the Gemini stages of the journal pipeline.
+
+Runs `PipelineService._generate_content` (references, sections, title) for a
+sample journal against recorded Gemini responses, then checks the results
+against the `models_journal` schemas and reports timings and the number of
+Gemini calls. Calls beyond one per stage are JSON field repairs.
+
+The committed fixture (benchmarks/fixtures/gemini_replay.jsonl) replays with
+no network or API key. It is built from `FakeProvider` schema samples, and its
+references answer is cut off inside the last reference. Replaying it therefore
+exercises JSON recovery, schema validation and one targeted field repair.
+Rebuild it whenever a pipeline prompt or response schema changes.
+
+Usage (from the repository root):
+    # offline, against the committed fixture
+    python -m benchmarks.replay_pipeline
+    # rebuild the fixture (offline)
+    python -m benchmarks.replay_pipeline --build-fixture
+    # record real Gemini answers (needs gemAPI1), then replay them with --file
+    python -m benchmarks.replay_pipeline --record --file Apps/DB/geminiRecordings.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "gemini_replay.jsonl")
+
+parser = argparse.ArgumentParser(description="Replay the pipeline's Gemini stages offline")
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument("--record", action="store_true", help="call Gemini and record its answers")
+mode.add_argument("--build-fixture", action="store_true", help="rebuild the recordings from FakeProvider")
+parser.add_argument("--file", default=FIXTURE, help="recordings file (default: the committed fixture)")
+parser.add_argument("--topic", default="Advances in green primary explosives")
+parser.add_argument("--brand", default="omics.tex")
+args = parser.parse_args()
+
+# Configuration is read at import time, so set it up before importing the app.
+# Recordings are keyed by model, prompt and response schema, so pin what shapes them.
+os.environ["GEMINI_REPLAY"] = "replay" if not (args.record or args.build_fixture) else "record"
+os.environ["GEMINI_REPLAY_FILE"] = args.file
+os.environ["LLM_PROVIDER"] = ""
+os.environ["PIPELINE_PROVIDER"] = "gemini"
+os.environ.setdefault("PIPELINE_SECTION_MODE", "parallel")
+os.environ.setdefault("GEMINI_STRUCTURED_OUTPUT", "1")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+if not args.record:
+    os.environ.setdefault("GEMINI_RPM", "0")
+
+from Apps.config import Config  # noqa: E402
+from Apps.models_journal import GeminiReference, GeminiReferences, GeminiSections  # noqa: E402
+from Apps.services.llm_providers import LLMProvider  # noqa: E402
+from Apps.services.pipeline_service import PipelineService  # noqa: E402
+from Apps.services.replay_client import ReplayGeminiClient, ReplayResponse  # noqa: E402
+
+
+class SampleJournal:
+    """The journal fields the Gemini stages read."""
+
+    topic = args.topic
+    journalName = "Journal of Chemical Sciences"
+    authorsDepartment = "Department of Chemistry"
+    brandName = args.brand
+
+
+class FixtureUpstream:
+    """
+    Stands in for Gemini while building the fixture: `FakeProvider` answers,
+    except that the references answer is cut off inside its last reference and
+    the field repair that follows returns that reference.
+    """
+
+    def __init__(self):
+        self.fake = LLMProvider.get("fake", PipelineService.PROVIDER.model)
+        self.aio = self
+        self.models = self
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        schema = (config or {}).get("response_schema")
+        last = f"C{PipelineService.REFERENCE_COUNT:03d}"
+        if schema is PipelineService.REFERENCES_SCHEMA:
+            text = self.fake.answer(contents, config)
+            cut = text.index(f'"{last}"')
+            return ReplayResponse(text[: cut + text[cut:].index('",') + 2])
+        if "some fields are missing or invalid" in contents:
+            reference = json.loads(self.fake.answer(contents, {"response_schema": GeminiReference}))
+            return ReplayResponse(json.dumps({"content": {last: reference}}))
+        return ReplayResponse(self.fake.answer(contents, config))
+
+
+async def main() -> int:
+    if args.build_fixture:
+        os.makedirs(os.path.dirname(args.file), exist_ok=True)
+        if os.path.exists(args.file):
+            os.remove(args.file)
+        Config._gemini_replay = ReplayGeminiClient(args.file, FixtureUpstream())
+
+    steps = []
+    start = time.perf_counter()
+
+    def progress(step: str, message: str) -> None:
+        steps.append((time.perf_counter() - start, step, message))
+
+    try:
+        references, sections, title = await PipelineService._generate_content(
+            SampleJournal, progress
+        )
+    except Exception as e:
+        print(f"FAILED: {type(e).__name__}: {getattr(e, 'detail', e)}")
+        print(f"Gemini calls: {Config._gemini_replay.stats if Config._gemini_replay else 0}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    for at, step, message in steps:
+        print(f"{at:7.2f}s  step {step:<4} {message}")
+    problems = PipelineService._schema_problems(
+        references, GeminiReferences
+    ) + PipelineService._schema_problems(sections, GeminiSections)
+    stats = Config._gemini_replay.stats
+    if args.build_fixture:
+        # Sections are recorded in completion order; sort for stable diffs of the fixture
+        with open(args.file, "r", encoding="utf-8") as f:
+            lines = sorted(f, key=lambda line: json.loads(line)["key"])
+        with open(args.file, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+    stages = 2 + len(PipelineService.SECTION_REQUIREMENTS)
+    print(f"\ntitle: {title}")
+    print(f"references: {len(references.get('content', {}))}, sections: {sorted(sections['content'])}")
+    print(f"schema problems: {problems or 'none'}")
+    print(f"Gemini calls: {stats}, field repairs: {stats['calls'] - stages}  ({elapsed:.2f}s)")
+    return 1 if problems or stats["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,109 @@
+"""
+End-to-end check of `TranslationPipelineService.translate_many` on a stored record.
+
+Without `--id`, a synthetic journal is first run through the full pipeline
+with the fake LLM provider, so the check translates an output record in
+exactly the shape the pipeline stores. Each language must then render
+its HTML and PDF. If Google Translate cannot be reached, the English text
+is kept, so the check also runs offline; it exits 1 if any language fails.
+
+The synthetic record and its output folders (PDFStorePulsus, TempLogsPulsus,
+PDFTranslatedStorePulsus) are deleted again afterwards, and the artifact
+cache and translation memory are turned off. The stores and caches are
+still opened under Apps/DB, so run it on a scratch checkout.
+
+Usage (from the repository root):
+    python -m benchmarks.translate_many_check [--id abc12] [--languages es fr de]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import string
+import sys
+
+parser = argparse.ArgumentParser(description="Run translate_many on a stored journal record")
+parser.add_argument("--id", help="existing output record (default: generate one offline)")
+parser.add_argument("--languages", nargs="+", default=["es", "fr", "de"])
+parser.add_argument("--brand", default="omics.tex")
+args = parser.parse_args()
+
+# Configuration is read at import time, so set it up before importing the app
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0")
+os.environ.setdefault("FAKE_LLM_JITTER", "0")
+os.environ.setdefault("TRANSLATE_RETRY_ATTEMPTS", "1")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("ARTIFACT_CACHE_MAX_MB", "0")
+os.environ.setdefault("TRANSLATION_MEMORY_MAX_ENTRIES", "0")
+
+from Apps.models_journal import PulsusInputStr  # noqa: E402
+from Apps.services.compile_service import CompileService  # noqa: E402
+from Apps.services.io_service import IOService  # noqa: E402
+from Apps.services.pipeline_service import PipelineService  # noqa: E402
+from Apps.services.translation_pipeline_service import TranslationPipelineService  # noqa: E402
+
+
+async def stored_record(journal_id: str) -> None:
+    """Run one synthetic journal through the pipeline under `journal_id`."""
+    await PipelineService.process_journal(
+        PulsusInputStr(
+            id=journal_id,
+            topic="Translation check: catalysis of small molecules",
+            journalName="Journal of Translation Checks",
+            shortJournalName="J Transl Check",
+            type="Research Article",
+            author="Test Author",
+            email="author@example.com",
+            brandName=args.brand,
+            authorsDepartment="Department of Chemistry",
+            received="2024-01-15",
+            manuscriptNo="TC-00001",
+            volume=1,
+            issues=1,
+            pdfNo=1,
+            parentLink="https://journal.example.com",
+        )
+    )
+
+
+def remove_record(journal_id: str) -> None:
+    """Delete the synthetic record and every folder built for it."""
+    IOService.deleteInputData(journal_id)
+    IOService.deleteOutputData(journal_id)
+    folders = [
+        f"Apps/DB/PDFStorePulsus/{journal_id}",
+        f"Apps/DB/TempLogsPulsus/{journal_id}",
+    ] + [
+        f"Apps/DB/PDFTranslatedStorePulsus/{language}_translate_{journal_id}"
+        for language in args.languages
+    ]
+    for folder in folders:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+async def main() -> int:
+    journal_id = args.id or "T" + "".join(
+        random.choices(string.ascii_lowercase + string.digits, k=5)
+    )
+    failed = 0
+    try:
+        if not args.id:
+            await stored_record(journal_id)
+        async for item in TranslationPipelineService.translate_many(journal_id, args.languages):
+            print(json.dumps(item, ensure_ascii=False, default=str))
+            failed += item.get("status") == "failed"
+    except Exception as e:
+        print(f"FAILED: {type(e).__name__}: {getattr(e, 'detail', e)}")
+        failed += 1
+    finally:
+        await CompileService.stop()
+        if not args.id:
+            remove_record(journal_id)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))